@@ -0,0 +1,28 @@
+"""Python driver for Infineon Digital Pressure Sensors (DPS310, DPS368, DPS422).
+
+`import DPS` loads only the core driver. Optional features are imported on
+first attribute access, e.g. `DPS.server`, `DPS.stream` or `DPS.rate`.
+"""
+
+from importlib import import_module
+
+from .core import CONVERSION_TIMES, SCALE_FACTORS, DPSCore, getTwosComplement
+from .dps310 import DPS
+from .dps422 import DPS422
+from .transport import BLOCK_MAX, CONFIG_MASKS, ConfigVerifyError, ResilientBus, applyRegisterProgram, busLock
+from .types import Coefficients, Coefficients422, Sample, SampleBatch
+
+
+# Optional feature modules, imported lazily by `__getattr__`
+_LAZY_MODULES = ('adaptive', 'capture', 'cli', 'fusion', 'metrics', 'output', 'pool', 'power',
+                 'rate', 'replay', 'rollup', 'server', 'stream', 'sync')
+
+
+def __getattr__(name):
+    if name in _LAZY_MODULES:
+        return import_module('.' + name, __name__)
+    raise AttributeError('module %r has no attribute %r' % (__name__, name))
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_MODULES))
@@ -0,0 +1,140 @@
+"""Adaptive oversampling for a background mode sample stream.
+
+A fixed oversampling rate is a compromise: high oversampling is too slow to
+follow fast pressure changes, low oversampling is noisier than needed while
+the pressure is steady. `AdaptiveOversampling` watches the rate of change
+and the residual noise of the last `window` samples (see `RateEstimator`)
+and steps the oversampling rate between configured bounds:
+
+* halve it while |dP/dt| exceeds `rate_threshold`, so the measurement rate
+  can double,
+* double it while |dP/dt| is below half the threshold and the noise is above
+  `noise_target`.
+
+Each oversampling rate runs at the highest measurement rate its conversion
+time allows. Switches go through `configure()`, which discards results of
+the old configuration, and are reported as `ConfigChange` events alongside
+the samples.
+"""
+
+import time
+from collections import namedtuple
+
+from .core import CONVERSION_TIMES, _log2Setting
+from .rate import RateEstimator
+from .stream import sampleStream
+
+
+ConfigChange = namedtuple('ConfigChange', ('timestamp', 'oversampling', 'rate', 'reason'))
+ConfigChange.__doc__ = """Configuration switch made by `AdaptiveOversampling`.
+
+timestamp: time of the switch (time.monotonic) [s]
+oversampling: new oversampling rate
+rate: new background measurements per second
+reason: 'rate' (signal changing fast) or 'noise' (signal quiet but noisy)
+"""
+
+
+def fastestRate(oversampling, max_rate=128):
+    """Get the highest background rate an oversampling rate allows.
+
+    Args:
+        oversampling (int): Oversampling rate, 1 to 128
+        max_rate (int): Upper limit, power of two
+
+    Returns:
+        int: Measurements per second
+    """
+    conversion = CONVERSION_TIMES[_log2Setting(oversampling, 'oversampling')]
+    rate = max_rate
+    while rate > 1 and rate * 2 * conversion >= 1.0:
+        rate //= 2
+    return rate
+
+
+class AdaptiveOversampling:
+    """Switch oversampling at runtime to follow the signal dynamics.
+    """
+
+    def __init__(self, sensor, min_oversampling=2, max_oversampling=64, window=16,
+                 rate_threshold=20.0, noise_target=0.5, max_rate=128):
+        """Initial setting.
+
+        Args:
+            sensor (DPS or DPS422): Sensor
+            min_oversampling (int): Lowest oversampling rate, 1 to 128
+            max_oversampling (int): Highest oversampling rate, 1 to 128
+            window (int): Samples per decision, see `RateEstimator`
+            rate_threshold (float): |dP/dt| above which oversampling is
+                lowered [Pa/s]
+            noise_target (float): Residual noise above which oversampling
+                is raised while the signal is quiet [Pa]
+            max_rate (int): Highest background rate, power of two
+        """
+        _log2Setting(min_oversampling, 'oversampling')
+        _log2Setting(max_oversampling, 'oversampling')
+        if min_oversampling > max_oversampling:
+            raise ValueError('min_oversampling is above max_oversampling')
+        self.sensor = sensor
+        self.min_oversampling = min_oversampling
+        self.max_oversampling = max_oversampling
+        self.rate_threshold = rate_threshold
+        self.noise_target = noise_target
+        self.max_rate = max_rate
+        self.estimator = RateEstimator(window)
+        self.oversampling = max_oversampling
+        self.rate = fastestRate(max_oversampling, max_rate)
+
+    def apply(self, oversampling=None):
+        """Configure the sensor for background mode at an oversampling rate.
+
+        Args:
+            oversampling (int): Oversampling rate, None for the current one
+        """
+        if oversampling is not None:
+            self.oversampling = oversampling
+        self.rate = fastestRate(self.oversampling, self.max_rate)
+        self.sensor.configure(self.rate, self.oversampling)
+        self.estimator.reset()
+
+    def update(self, sample):
+        """Feed a sample and switch the configuration if needed.
+
+        After a switch the estimator starts over, so the next decision is
+        made on a full window of samples of the new configuration.
+
+        Args:
+            sample (tuple): (timestamp, pressure, temperature)
+
+        Returns:
+            ConfigChange: The switch made, None if the configuration stays
+        """
+        rate, _ = self.estimator.update(sample)
+        if rate is None or len(self.estimator) < self.estimator.window:
+            return None
+        noise = self.estimator.noise()
+        if abs(rate) > self.rate_threshold and self.oversampling > self.min_oversampling:
+            oversampling, reason = self.oversampling // 2, 'rate'
+        elif (abs(rate) < self.rate_threshold / 2 and noise is not None and noise > self.noise_target
+              and self.oversampling < self.max_oversampling):
+            oversampling, reason = self.oversampling * 2, 'noise'
+        else:
+            return None
+        self.apply(oversampling)
+        return ConfigChange(time.monotonic(), self.oversampling, self.rate, reason)
+
+    def run(self, count=None, stop=None, stats=None):
+        """Configure the sensor and read samples at its native rate.
+
+        Args:
+            count (int): Number of samples, None for endless
+            stop (threading.Event): Ends the stream when set
+            stats (TimingStats): Updated with every sample
+
+        Yields:
+            Sample: (timestamp, pressure, temperature)
+            ConfigChange: Switch made after this sample, None if none
+        """
+        self.apply()
+        for sample in sampleStream(self.sensor, None, count, stop, stats=stats):
+            yield sample, self.update(sample)
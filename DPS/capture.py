@@ -0,0 +1,126 @@
+"""Event-triggered burst capture.
+
+`BurstCapture` keeps the sensor at a low-power background rate and the last
+samples in a pre-trigger ring buffer. When the pressure moves by more than
+`threshold` across the ring buffer, or `trigger()` is called from another
+thread, it switches to the fastest rate of the burst oversampling (through
+the FIFO on the DPS310 / DPS368) for `window` seconds, returns to the idle
+configuration and hands back the pre- and post-trigger samples as one
+`SampleBatch`.
+
+    capture = BurstCapture(dps368, threshold=20.0, window=2.0)
+    for batch in capture.run():
+        print(len(batch), 'samples around', capture.trigger_time)
+"""
+
+import threading
+import time
+from collections import deque
+
+from .adaptive import fastestRate
+from .stream import fifoStream, sampleStream
+from .types import SampleBatch
+
+
+class BurstCapture:
+    """Low-rate watch with high-rate capture around events.
+    """
+
+    def __init__(self, sensor, threshold=None, window=1.0, pre_trigger=16,
+                 idle_rate=4, idle_oversampling=8, burst_oversampling=2, max_rate=128):
+        """Initial setting.
+
+        Args:
+            sensor (DPS or DPS422): Sensor
+            threshold (float): Pressure change across the pre-trigger buffer
+                that triggers a capture [Pa], None for `trigger()` only
+            window (float): Post-trigger capture time [s]
+            pre_trigger (int): Samples kept from before the trigger
+            idle_rate (int): Background rate while waiting, 1 to 128
+            idle_oversampling (int): Oversampling while waiting, 1 to 128
+            burst_oversampling (int): Oversampling during a capture; the
+                rate is the highest it allows
+            max_rate (int): Highest burst rate, power of two
+        """
+        self.sensor = sensor
+        self.threshold = threshold
+        self.window = window
+        self.idle_rate = idle_rate
+        self.idle_oversampling = idle_oversampling
+        self.burst_oversampling = burst_oversampling
+        self.burst_rate = fastestRate(burst_oversampling, max_rate)
+        self.fifo = hasattr(sensor, 'readFifo')
+        self.trigger_time = None
+        self.__ring = deque(maxlen=pre_trigger)
+        self.__triggered = threading.Event()
+
+    def trigger(self):
+        """Start a capture at the next idle sample. Thread-safe.
+        """
+        self.__triggered.set()
+
+    def __idle(self):
+        self.sensor.configure(self.idle_rate, self.idle_oversampling)
+        self.__ring.clear()
+
+    def __isEvent(self, sample):
+        if self.__triggered.is_set():
+            return True
+        if self.threshold is None or not self.__ring:
+            return False
+        return abs(sample[1] - self.__ring[0][1]) > self.threshold
+
+    def capture(self, stop=None, timeout=None):
+        """Wait for an event and capture around it.
+
+        Args:
+            stop (threading.Event): Gives up waiting when set
+            timeout (float): Max wait time for an event [s], None for no limit
+
+        Returns:
+            SampleBatch: Pre-trigger samples followed by the burst, None if
+                no event happened
+        """
+        self.__idle()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for sample in sampleStream(self.sensor, None, stop=stop):
+            if self.__isEvent(sample):
+                break
+            self.__ring.append(sample)
+            if deadline is not None and time.monotonic() > deadline:
+                return None
+        else:
+            return None
+        self.__triggered.clear()
+        self.trigger_time = sample[0]
+        batch = SampleBatch(self.__ring)
+        batch.append(sample)
+
+        self.sensor.configure(self.burst_rate, self.burst_oversampling, fifo=self.fifo)
+        if self.fifo:
+            samples = fifoStream(self.sensor, stop=stop)
+        else:
+            samples = sampleStream(self.sensor, None, stop=stop)
+        end = self.trigger_time + self.window
+        try:
+            for sample in samples:
+                if sample[0] > end:
+                    break
+                batch.append(sample)
+        finally:
+            self.__idle()
+        return batch
+
+    def run(self, stop=None):
+        """Capture every event until stopped.
+
+        Args:
+            stop (threading.Event): Ends the capture loop when set
+
+        Yields:
+            SampleBatch: Samples around one event
+        """
+        while stop is None or not stop.is_set():
+            batch = self.capture(stop)
+            if batch is not None:
+                yield batch
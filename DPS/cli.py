@@ -0,0 +1,199 @@
+"""Command-line acquisition tool.
+
+    dps-acquire --rate 32 --oversampling 8 --duration 60 --format csv -o log.csv
+
+Sensors are discovered on the I2C bus unless addresses are given. Samples
+are read at the sensor's native rate, through the FIFO on the DPS310 /
+DPS368 and by polling PRS_RDY on the DPS422. At the end, the achieved rate,
+dropped samples and bus errors of every sensor are printed to stderr.
+
+Output is written by `DPS.output.SampleWriter` with a sensor column holding
+the I2C address:
+
+* ``text``: ``0x77 123.456 s 98765.4 Pa 21.3 C``
+* ``csv``: ``sensor,timestamp,pressure_Pa,temperature_C`` header and rows
+* ``jsonl``: one JSON object per sample
+* ``binary``: `SENSOR_RECORD` = (I2C address, timestamp [s], pressure [Pa],
+  temperature [C]) as little-endian uint8 and three doubles
+"""
+
+import argparse
+import queue
+import sys
+import threading
+import time
+
+from .dps310 import DPS
+from .dps422 import DPS422
+from .output import FORMATS, SampleWriter
+from .stream import TimingStats, fifoStream, sampleStream
+from .transport import ResilientBus
+
+
+# I2C addresses a DPS can be strapped to
+ADDRESSES = (0x77, 0x76)
+
+
+def discover(bus=1, chip=DPS):
+    """Find sensors on the bus.
+
+    Devices at the DPS addresses that answer with another product ID, like
+    a BMP280, are skipped.
+
+    Args:
+        bus (int or SMBus): I2C bus number or SMBus-compatible object
+        chip (class): `DPS` or `DPS422`, whose `PRODUCT_ID` is matched
+
+    Returns:
+        list: I2C addresses of the sensors found
+    """
+    reg, mask, value = chip.PRODUCT_ID
+    probe = ResilientBus(bus, retries=0)
+    found = []
+    for addr in ADDRESSES:
+        try:
+            product_id = probe.read_byte_data(addr, reg)
+        except OSError:
+            continue
+        if product_id & mask == value:
+            found.append(addr)
+    return found
+
+
+class _Acquisition(threading.Thread):
+    """Reads one sensor into a shared queue.
+    """
+
+    def __init__(self, sensor, addr, out, stop, count):
+        super().__init__(daemon=True)
+        self.sensor = sensor
+        self.addr = addr
+        self.out = out
+        self.stop = stop
+        self.count = count
+        self.stats = TimingStats(sensor.getSamplePeriod())
+        self.error = None
+
+    def run(self):
+        if hasattr(self.sensor, 'readFifo'):
+            samples = fifoStream(self.sensor, self.count, self.stop, self.stats)
+        else:
+            samples = sampleStream(self.sensor, None, self.count, self.stop, stats=self.stats)
+        try:
+            for sample in samples:
+                self.out.put((self.addr, sample))
+        except OSError as e:
+            self.error = e
+        finally:
+            self.out.put((self.addr, None))
+
+    def summary(self):
+        stats = self.stats
+        period = stats.nominal
+        expected = 0
+        if stats.count:
+            expected = round((stats.last - stats.first) / period) + 1
+        duration = stats.last - stats.first if stats.count > 1 else 0.0
+        rate = (stats.count - 1) / duration if duration else 0.0
+        bus = self.sensor.getStats()
+        line = (f'{self.addr:#04x}: {stats.count} samples, {rate:.2f} Hz (nominal {1 / period:g} Hz), '
+                f'{max(0, expected - stats.count)} dropped, {stats.overflows} FIFO overflows, '
+                f'{bus["bus_errors"]} bus errors, {bus["retries"]} retries, '
+                f'{bus["reinits"]} reinits, jitter {stats.jitter * 1000:.2f} ms')
+        if self.error is not None:
+            line += f', stopped by {self.error}'
+        return line
+
+
+def _parseArgs(argv):
+    parser = argparse.ArgumentParser(prog='dps-acquire', description='Acquire DPS pressure and temperature samples.')
+    parser.add_argument('--bus', type=int, default=1, help='I2C bus number (default: 1)')
+    parser.add_argument('--addr', type=lambda v: int(v, 0), action='append',
+                        help='sensor address, repeatable (default: discover)')
+    parser.add_argument('--chip', choices=('dps', 'dps422'), default='dps',
+                        help='dps for DPS310 / DPS368, dps422 for DPS422 (default: dps)')
+    parser.add_argument('--rate', type=int, default=4, help='measurements per second, 1-128 (default: 4)')
+    parser.add_argument('--oversampling', type=int, default=64, help='oversampling rate, 1-128 (default: 64)')
+    parser.add_argument('--duration', type=float, help='stop after this many seconds')
+    parser.add_argument('--count', type=int, help='stop after this many samples per sensor')
+    parser.add_argument('--format', choices=sorted(FORMATS), default='text', help='output format (default: text)')
+    parser.add_argument('-o', '--output', help='output file (default: stdout)')
+    parser.add_argument('--scan', action='store_true', help='list sensors found on the bus and exit')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run the acquisition tool.
+
+    Args:
+        argv (list): Command-line arguments, None for `sys.argv`
+
+    Returns:
+        int: Exit status
+    """
+    args = _parseArgs(argv)
+    cls = DPS if args.chip == 'dps' else DPS422
+    addrs = args.addr or discover(args.bus, cls)
+    if args.scan:
+        for addr in addrs:
+            print(f'{addr:#04x}')
+        return 0
+    if not addrs:
+        print(f'no sensor found on bus {args.bus}', file=sys.stderr)
+        return 1
+
+    fifo = cls is DPS
+    out = queue.Queue()
+    stop = threading.Event()
+    workers = []
+    for addr in addrs:
+        sensor = cls(args.bus, addr)
+        try:
+            sensor.configure(args.rate, args.oversampling, fifo=fifo)
+        except ValueError as e:
+            print(f'dps-acquire: {e}', file=sys.stderr)
+            return 2
+        workers.append(_Acquisition(sensor, addr, out, stop, args.count))
+
+    if args.output:
+        f = open(args.output, 'wb')
+    else:
+        f = sys.stdout.buffer
+    precision = (3, 1, 1) if args.format == 'text' else (6, 2, 3)
+    writer = SampleWriter(f, args.format, precision=precision, sensor=True)
+
+    deadline = None if args.duration is None else time.monotonic() + args.duration
+    running = len(workers)
+    for worker in workers:
+        worker.start()
+    try:
+        while running:
+            timeout = None if deadline is None else deadline - time.monotonic()
+            if timeout is not None and timeout <= 0:
+                break
+            try:
+                addr, sample = out.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if sample is None:
+                running -= 1
+            else:
+                writer.write(sample, addr)
+            if out.empty():
+                # Write what has arrived; a batch fills up only at high rates
+                writer.flush()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        writer.flush()
+        if args.output:
+            f.close()
+    for worker in workers:
+        worker.join(1.0)
+        print(worker.summary(), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
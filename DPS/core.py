@@ -0,0 +1,665 @@
+"""Shared core of the DPS drivers.
+
+`DPSCore` holds everything the DPS310/DPS368 and the DPS422 have in common:
+configuration, reset recovery, raw result reads, scaling and sample timing.
+The chip classes add their coefficient register map and compensation.
+"""
+
+import threading
+from array import array
+from time import monotonic, sleep
+
+from .transport import ResilientBus, applyRegisterProgram
+from .types import Sample
+
+
+# Conversion time [s] of one pressure or temperature measurement,
+# indexed by the oversampling setting (PM_PRC / TMP_PRC, 1 to 128 times)
+CONVERSION_TIMES = (0.0036, 0.0052, 0.0084, 0.0148, 0.0276, 0.0532, 0.1044, 0.2068)
+
+# Compensation scale factors (kP / kT), indexed by the oversampling setting
+SCALE_FACTORS = (524288, 1572864, 3670016, 7864320, 253952, 516096, 1040384, 2088960)
+
+
+def _log2Setting(value, name):
+    """Get the 3-bit register setting of a power-of-two rate.
+
+    Args:
+        value (int): 1, 2, 4, ... 128
+        name (str): Parameter name for the error message
+
+    Returns:
+        int: log2(value)
+    """
+    bits = value.bit_length() - 1
+    if value < 1 or value != 1 << bits or bits > 7:
+        raise ValueError('%s must be a power of two from 1 to 128, not %r' % (name, value))
+    return bits
+
+
+def getTwosComplement(raw_val, length):
+    """Get two's complement of `raw_val`.
+
+    Args:
+        raw_val (int): Raw value
+        length (int): Max bit length
+
+    Returns:
+        int: Two's complement
+    """
+    val = raw_val
+    if raw_val & (1 << (length - 1)):
+        val = raw_val - (1 << length)
+    return val
+
+
+class DPSCore:
+    """Common base of the DPS sensor classes.
+
+    Subclasses implement `getCoefficients()`, `calcCompTemperature()` and
+    `calcCompPressure()`, reading their coefficients with `_readRegisters()`.
+
+    Thread safety: all public methods may be called from any thread. Calls
+    on one sensor object are serialized by its `lock` (reentrant, so hold
+    it to group several calls). Sequences of register accesses that belong
+    together, like the temperature and pressure results of one sample or a
+    configuration program, also hold `bus_lock`, the lock of the bus (see
+    `busLock()`), so sensor objects sharing a bus or an address never see
+    each other's transactions half done. Waits for a result do not hold the bus lock,
+    and sensors on different buses never wait for each other.
+    """
+
+    # Compensation Scale Factors
+    # Oversampling Rate          | Scale Factor (kP or kT)
+    # ---------------------------|------------------------
+    #   1       (single)         |  524288
+    #   2 times (Low Power)      | 1572864
+    #   4 times                  | 3670016
+    #   8 times                  | 7864320
+    #  16 times (Standard)       |  253952
+    #  32 times                  |  516096
+    #  64 times (High Precision) | 1040384  <- Configured
+    # 128 times                  | 2088960
+    __kP = 1040384
+    __kT = 1040384
+
+    # Register programs, (register, value) pairs written in order
+    TEMPERATURE_CORRECTION = ((0x0E, 0xA5), (0x0F, 0x96), (0x62, 0x02), (0x0E, 0x00), (0x0F, 0x00))
+
+    # Oversampling Rate Setting (64time) and Oversampling Rate Configuration
+    MEASUREMENT_CONFIG = ((0x06, 0x26), (0x07, 0xA6), (0x08, 0x07), (0x09, 0x0C))
+
+    def __init__(self, bus=1, addr=0x77, retries=3, timeout=0.1, check_interval=1.0,
+                 verify=False, wait_ready=False):
+        """Initial setting.
+
+        Execute `self.correctTemperature()` and `self.setOversamplingRate()`.
+
+        Args:
+            bus (int or SMBus): I2C bus number or SMBus-compatible object
+            addr (int): I2C address of the sensor (0x77 or 0x76)
+            retries (int): Max retries per failed bus transaction
+            timeout (float): Max time spent retrying one transaction [s]
+            check_interval (float): Min time between two sensor reset
+                checks [s], None to check only after bus errors
+            verify (bool): Read the measurement configuration back after
+                writing it and raise `ConfigVerifyError` on a mismatch
+            wait_ready (bool): Wait for SENSOR_RDY before writing the
+                configuration and return only once the first results are
+                available, see `waitReady()`
+        """
+        self.lock = threading.RLock()
+        self.__bus = ResilientBus(bus, retries, timeout)
+        self.bus_lock = self.__bus.lock
+        self.__addr = addr
+        self.__check_interval = check_interval
+        self.__verify = verify
+        self.__last_check = monotonic()
+        self.reinit_count = 0
+        self.__switched = False
+        if wait_ready:
+            # Writes before SENSOR_RDY may be lost, typically 12 ms after power-up
+            self.__waitStatus(0x40, 0.05)
+        self.__correctTemperature()
+        self.__setOversamplingRate()
+        if wait_ready:
+            self.waitReady()
+
+    def __correctTemperature(self):
+        """Correct temperature.
+
+        DPS sometimes indicates a temperature over 60 degree Celsius
+        although room temperature is around 20-30 degree Celsius.
+        Call this function to fix.
+        """
+        # Correct Temp. The hidden register 0x62 cannot be read back,
+        # so this program is always written in full.
+        applyRegisterProgram(self.__bus, self.__addr, self.TEMPERATURE_CORRECTION)
+
+    def __setOversamplingRate(self):
+        """Set oversampling rate.
+
+        Pressure measurement rate    :  4 Hz
+        Pressure oversampling rate   : 64 times
+        Temperature measurement rate :  4 Hz
+        Temperature oversampling rate: 64 times
+        """
+        applyRegisterProgram(self.__bus, self.__addr, self.MEASUREMENT_CONFIG,
+                             skip_unchanged=True, verify=self.__verify)
+
+    def configure(self, rate=4, oversampling=64, fifo=False, background=True):
+        """Set measurement rate and oversampling of pressure and temperature.
+
+        The switch is glitch-free: background measurements are stopped and
+        pending results discarded before the new configuration is written,
+        and the next `measureSample()` waits for a temperature and a
+        pressure result measured with it.
+
+        Args:
+            rate (int): Background mode measurements per second, 1 to 128
+            oversampling (int): Oversampling rate, 1 to 128
+            fifo (bool): Store background mode results in the FIFO
+            background (bool): Measure continuously; if False the sensor
+                stays in standby and `measureSample()` triggers one
+                conversion per call (command mode)
+
+        Raises:
+            ValueError: Invalid setting, or pressure and temperature
+                measurements do not fit into one second at this rate
+        """
+        with self.lock, self.bus_lock:
+            rate_bits = _log2Setting(rate, 'rate')
+            prc = _log2Setting(oversampling, 'oversampling')
+            if rate * 2 * CONVERSION_TIMES[prc] >= 1.0:
+                raise ValueError('%d times oversampling is too slow for %d Hz' % (oversampling, rate))
+            # P_SHIFT / T_SHIFT are required above 8 times oversampling
+            cfg_reg = (0x0C if prc > 3 else 0x00) | (0x02 if fifo else 0x00)
+            config = ((0x06, (rate_bits << 4) | prc),
+                      (0x07, 0x80 | (rate_bits << 4) | prc),
+                      (0x08, 0x07 if background else 0x00),
+                      (0x09, cfg_reg))
+            # Stop background mode and clear PRS_RDY / TMP_RDY of old results,
+            # also those of command mode conversions
+            self.__bus.write_byte_data(self.__addr, 0x08, 0x00)
+            self._readRegisters(0x00, 6)
+            self.__switched = background
+            self.MEASUREMENT_CONFIG = config
+            self.__kP = self.__kT = SCALE_FACTORS[prc]
+            self.__setOversamplingRate()
+            if fifo:
+                # Flush results of the previous configuration
+                self.__bus.write_byte_data(self.__addr, 0x0C, 0x80)
+
+    def checkReset(self):
+        """Detect a sensor reset and restore the configuration.
+
+        After a reset (e.g. a brownout) the sensor boots with default
+        configuration in idle mode. Wait for SENSOR_RDY, read PRS_CFG,
+        TMP_CFG and MEAS_CFG back in one burst, and replay the init sequence
+        if they no longer match the configuration (the measurement control
+        bits only in background mode, as they change during command mode
+        conversions). The FIFO, if used, is flushed.
+
+        Returns:
+            bool: True if the sensor was reinitialized; in background mode
+                the next sample then waits for new results
+        """
+        with self.lock:
+            self.__last_check = monotonic()
+            self.__bus.faulted = False
+            deadline = self.__last_check + 0.05
+            prs_cfg, tmp_cfg, meas_cfg = self._readRegisters(0x06, 3)
+            while not meas_cfg & 0x40 and monotonic() < deadline:
+                sleep(0.002)
+                prs_cfg, tmp_cfg, meas_cfg = self._readRegisters(0x06, 3)
+            config = dict(self.MEASUREMENT_CONFIG)
+            if ((prs_cfg ^ config[0x06]) & 0x7F == 0 and tmp_cfg == config[0x07]
+                    and (config[0x08] == 0 or meas_cfg & 0x07 == config[0x08])):
+                return False
+            self.__correctTemperature()
+            self.__setOversamplingRate()
+            if config[0x09] & 0x02:
+                self.__bus.write_byte_data(self.__addr, 0x0C, 0x80)
+            # The result registers read zero until the sensor has measured again
+            self.__switched = config[0x08] != 0
+            self.reinit_count += 1
+            return True
+
+    def _checkResetIfDue(self):
+        """Run `self.checkReset()` after a bus error or every `check_interval`.
+
+        Returns:
+            bool: True if the sensor was reinitialized
+        """
+        if self.__bus.faulted or (self.__check_interval is not None
+                and monotonic() - self.__last_check >= self.__check_interval):
+            return self.checkReset()
+        return False
+
+    def getStats(self):
+        """Get bus and recovery counters.
+
+        Returns:
+            dict: Counts of bus errors, retries, failed transactions and
+                reinitializations
+        """
+        return {
+            'bus_errors': self.__bus.error_count,
+            'retries': self.__bus.retry_count,
+            'failures': self.__bus.failure_count,
+            'reinits': self.reinit_count,
+        }
+
+    def getSamplePeriod(self):
+        """Get the configured pressure measurement period.
+
+        Returns:
+            float: Time between two background mode measurements [s]
+        """
+        prs_cfg = dict(self.MEASUREMENT_CONFIG)[0x06]
+        return 1.0 / (1 << ((prs_cfg >> 4) & 0x07))
+
+    def getConversionTime(self):
+        """Get the conversion time of one pressure measurement.
+
+        Returns:
+            float: Conversion time at the configured oversampling rate [s]
+        """
+        prs_cfg = dict(self.MEASUREMENT_CONFIG)[0x06]
+        return CONVERSION_TIMES[prs_cfg & 0x0F]
+
+    def __waitStatus(self, mask, timeout, expected=0.0, every=False):
+        """Poll MEAS_CFG until one of the `mask` bits is set.
+
+        Args:
+            mask (int): 0x10 for PRS_RDY, 0x20 for TMP_RDY
+            timeout (float): Max wait time [s]
+            expected (float): Time the result cannot be ready before [s],
+                slept through without polling
+            every (bool): Wait until all `mask` bits are set
+
+        Returns:
+            float: Estimated time the bit was set (time.monotonic)
+        """
+        start = monotonic()
+        if expected > 0.001:
+            sleep(expected - 0.001)
+        polled = monotonic()
+        while True:
+            meas_cfg = self.__bus.read_byte_data(self.__addr, 0x08)
+            now = monotonic()
+            if (meas_cfg & mask == mask) if every else (meas_cfg & mask):
+                return (polled + now) / 2
+            if now - start > timeout:
+                raise TimeoutError('no result within %.3f s' % (now - start))
+            polled = now
+            sleep(0.001)
+
+    def waitReady(self, timeout=None):
+        """Wait until the sensor delivers valid results.
+
+        Polls SENSOR_RDY and COEF_RDY, reads the coefficients as soon as
+        they are available and, in background mode, waits for the first
+        temperature and pressure result of the configuration. Use this
+        instead of a fixed delay after power-up or construction.
+
+        Args:
+            timeout (float): Max wait time [s], None for the worst case of
+                the startup time and two measurement periods
+
+        Returns:
+            float: Time the sensor became ready (time.monotonic)
+
+        Raises:
+            TimeoutError: The sensor did not become ready in time
+        """
+        with self.lock:
+            if timeout is None:
+                timeout = 0.05 + 2 * self.getSamplePeriod() + 2 * self.getConversionTime()
+            deadline = monotonic() + timeout
+            # SENSOR_RDY and COEF_RDY, typically 12 ms and 40 ms after power-up
+            ready = self.__waitStatus(0xC0, timeout, every=True)
+            self.getCoefficients()
+            if dict(self.MEASUREMENT_CONFIG)[0x08] == 0x07:
+                ready = self.__waitStatus(0x30, max(0.0, deadline - monotonic()), every=True)
+            return ready
+
+    def __waitPressureReady(self):
+        """Poll MEAS_CFG until PRS_RDY reports a new pressure result.
+
+        Returns:
+            float: Estimated time the result became ready (time.monotonic)
+        """
+        return self.__waitStatus(0x10, 2 * self.getSamplePeriod() + self.getConversionTime())
+
+    def __waitSwitched(self):
+        """Wait for the first results after `configure()` or a reinit.
+
+        Returns:
+            float: Estimated time the pressure result became ready (time.monotonic)
+        """
+        self.__waitStatus(0x20, 2 * self.getSamplePeriod() + 2 * self.getConversionTime())
+        self.__switched = False
+        return self.__waitPressureReady()
+
+    def measureOneShot(self):
+        """Measure temperature and pressure once in command mode.
+
+        Runs one temperature and one pressure conversion; afterwards the
+        sensor returns to standby by itself. Meant for a sensor configured
+        with `configure(..., background=False)`.
+
+        Returns:
+            Sample: Timestamped at the middle of the pressure conversion
+        """
+        timestamp, raw_p, raw_t = self.__measureOneShotRaw()
+        temperature, pressure = self._compensate(raw_p, raw_t)
+        return Sample(timestamp, pressure, temperature)
+
+    def __measureOneShotRaw(self):
+        with self.lock:
+            self._checkResetIfDue()
+            conversion = self.getConversionTime()
+            self.__bus.write_byte_data(self.__addr, 0x08, 0x02)
+            self.__waitStatus(0x20, 2 * conversion + 0.01, conversion)
+            self.__bus.write_byte_data(self.__addr, 0x08, 0x01)
+            start = monotonic()
+            ready = self.__waitStatus(0x10, 2 * conversion + 0.01, conversion)
+            return ((start + ready) / 2,) + self._readRawResults()
+
+    def startConversion(self, temperature=False):
+        """Start one command mode conversion without waiting for it.
+
+        For sensors configured with `configure(..., background=False)`;
+        see `DPS.sync` for triggering several sensors together. Only writes
+        the command, so run `checkReset()` as needed before.
+
+        Args:
+            temperature (bool): Measure temperature instead of pressure
+
+        Returns:
+            float: Time the command was written (time.monotonic)
+        """
+        before = monotonic()
+        self.__bus.write_byte_data(self.__addr, 0x08, 0x02 if temperature else 0x01)
+        return (before + monotonic()) / 2
+
+    def isReady(self, temperature=False):
+        """Check whether a new result is available.
+
+        Args:
+            temperature (bool): Check TMP_RDY instead of PRS_RDY
+
+        Returns:
+            bool: True if the result is ready
+        """
+        return bool(self.__bus.read_byte_data(self.__addr, 0x08) & (0x20 if temperature else 0x10))
+
+    def measureRawSample(self, fresh=False):
+        """Measure raw pressure and temperature with a timestamp.
+
+        Same timing as `measureSample()`, without compensation. Raw results
+        can be recorded and compensated later (see `DPS.replay`).
+
+        Args:
+            fresh (bool): Wait for a new pressure result before reading
+
+        Returns:
+            float: Timestamp [s, time.monotonic]
+            int: Raw pressure
+            int: Raw temperature
+        """
+        with self.lock:
+            if dict(self.MEASUREMENT_CONFIG)[0x08] == 0:
+                return self.__measureOneShotRaw()
+            half_conversion = self.getConversionTime() / 2
+            self._checkResetIfDue()
+            if self.__switched:
+                timestamp = self.__waitSwitched() - half_conversion
+            elif fresh:
+                timestamp = self.__waitPressureReady() - half_conversion
+            else:
+                timestamp = monotonic() - self.getSamplePeriod() / 2 - half_conversion
+            return (timestamp,) + self._readRawResults()
+
+    def measureSample(self, fresh=False):
+        """Measure compensated pressure and temperature with a timestamp.
+
+        The timestamp is back-dated to the estimated middle of the pressure
+        conversion. Without `fresh` the latest result is on average half a
+        measurement period old; with `fresh` the driver waits for PRS_RDY,
+        which pins the timestamp to within about a millisecond. In command
+        mode this is `measureOneShot()`.
+
+        Args:
+            fresh (bool): Wait for a new pressure result before reading
+
+        Returns:
+            Sample: (timestamp [s, time.monotonic], pressure [Pa], temperature [C])
+        """
+        timestamp, raw_p, raw_t = self.measureRawSample(fresh)
+        temperature, pressure = self._compensate(raw_p, raw_t)
+        return Sample(timestamp, pressure, temperature)
+
+    def _readRawResults(self):
+        """Read the pressure and temperature results in one burst.
+
+        Returns:
+            int: Raw pressure
+            int: Raw temperature
+        """
+        p1, p2, p3, t1, t2, t3 = self._readRegisters(0x00, 6)
+        p = getTwosComplement((p1 << 16) | (p2 << 8) | p3, 24)
+        t = getTwosComplement((t1 << 16) | (t2 << 8) | t3, 24)
+        return p, t
+
+    def _readRegisters(self, reg, length):
+        """Read consecutive registers in one burst.
+
+        Args:
+            reg (int): First register
+            length (int): Number of registers
+
+        Returns:
+            list: Register values
+        """
+        return self.__bus.read_i2c_block_data(self.__addr, reg, length)
+
+    def _compensate(self, raw_p, raw_t):
+        """Compensate raw results.
+
+        Args:
+            raw_p (int): Raw pressure
+            raw_t (int): Raw temperature
+
+        Returns:
+            float: Compensated temperature [C]
+            float: Compensated pressure [Pa]
+        """
+        return self._compensateScaled(raw_p / self.__kP, raw_t / self.__kT)
+
+    def _compensateScaled(self, scaled_p, scaled_t):
+        """Compensate scaled results.
+
+        Chip classes may override this to share work between the
+        temperature and the pressure compensation.
+
+        Args:
+            scaled_p (float): Scaled pressure
+            scaled_t (float): Scaled temperature
+
+        Returns:
+            float: Compensated temperature [C]
+            float: Compensated pressure [Pa]
+        """
+        return self.calcCompTemperature(scaled_t), self.calcCompPressure(scaled_p, scaled_t)
+
+    def compensateBatch(self, raw_pressures, raw_temperatures):
+        """Compensate many raw results at once.
+
+        NumPy arrays are compensated element-wise in one pass of array
+        operations; other sequences are compensated in a loop into
+        `array('d')` columns (see `SampleBatch`).
+
+        Args:
+            raw_pressures (sequence): Raw pressures
+            raw_temperatures (sequence): Raw temperatures, same length
+
+        Returns:
+            array: Compensated temperatures [C]
+            array: Compensated pressures [Pa]
+        """
+        if hasattr(raw_pressures, 'dtype'):
+            return self._compensateScaled(raw_pressures / self.__kP, raw_temperatures / self.__kT)
+        k_p = self.__kP
+        k_t = self.__kT
+        return self._compensateScaledBatch([p / k_p for p in raw_pressures],
+                                           [t / k_t for t in raw_temperatures])
+
+    def _compensateScaledBatch(self, scaled_p, scaled_t):
+        """Compensate lists of scaled results.
+
+        Args:
+            scaled_p (list): Scaled pressures
+            scaled_t (list): Scaled temperatures
+
+        Returns:
+            array: Compensated temperatures [C]
+            array: Compensated pressures [Pa]
+        """
+        temperatures = array('d')
+        pressures = array('d')
+        for p, t in zip(scaled_p, scaled_t):
+            temperature, pressure = self._compensateScaled(p, t)
+            temperatures.append(temperature)
+            pressures.append(pressure)
+        return temperatures, pressures
+
+    def __getRawPressure(self):
+        """Get raw pressure from sensor.
+
+        Returns:
+            int: Raw pressure
+        """
+        with self.lock:
+            self._checkResetIfDue()
+            if self.__switched:
+                self.__waitSwitched()
+            p1, p2, p3 = self._readRegisters(0x00, 3)
+        p = (p1 << 16) | (p2 << 8) | p3
+        p = getTwosComplement(p, 24)
+        return p
+
+    def __getRawTemperature(self):
+        """Get raw temperature from sensor.
+
+        Returns:
+            int: Raw temperature
+        """
+        with self.lock:
+            self._checkResetIfDue()
+            if self.__switched:
+                self.__waitSwitched()
+            t1, t2, t3 = self._readRegisters(0x03, 3)
+        t = (t1 << 16) | (t2 << 8) | t3
+        t = getTwosComplement(t, 24)
+        return t
+
+    def calcScaledPressure(self):
+        """Calculate scaled pressure.
+
+        Returns:
+            float: Scaled pressure
+        """
+        raw_p = self.__getRawPressure()
+        scaled_p = raw_p / self.__kP
+        return scaled_p
+
+    def calcScaledTemperature(self):
+        """Calculate scaled temperature.
+
+        Returns:
+            float: Scaled temperature
+        """
+        raw_t = self.__getRawTemperature()
+        scaled_t = raw_t / self.__kT
+        return scaled_t
+
+    def getCoefficients(self):
+        """Get the calibration coefficients.
+
+        Returns:
+            tuple: Chip specific coefficients, see `DPS.types`
+        """
+        raise NotImplementedError
+
+    def calcCompTemperature(self, scaled_t):
+        """Calculate compensated temperature.
+
+        Args:
+            scaled_t (float): Scaled temperature
+
+        Returns:
+            float: Compensated temperature [C]
+        """
+        raise NotImplementedError
+
+    def calcCompPressure(self, scaled_p, scaled_t):
+        """Calculate compensated pressure.
+
+        Args:
+            scaled_p (float): Scaled pressure
+            scaled_t (float): Scaled temperature
+
+        Returns:
+            float: Compensated pressure [Pa]
+        """
+        raise NotImplementedError
+
+    def measureTemperatureOnce(self):
+        """Measures compensated temperature once.
+
+        Returns:
+            float:One compensated temperature value [C]
+        """
+        with self.lock:
+            t = self.calcScaledTemperature()
+            temperature = self.calcCompTemperature(t)
+            return temperature
+
+    def measurePressureOnce(self):
+        """Measure compensated pressure once.
+
+        Returns:
+            float:One Compensated pressure value [Pa]
+        """
+        p, t = self.__getScaledResults()
+        pressure = self.calcCompPressure(p, t)
+        return pressure
+
+    def measureBothOnce(self):
+        """ measures compensated temperature and compensated pressure once
+
+        Returns:
+            float: Compensated Temperature
+            float: Compensated Pressure
+        """
+        p, t = self.__getScaledResults()
+        return self._compensateScaled(p, t)
+
+    def __getScaledResults(self):
+        """Get scaled pressure and temperature of one sample.
+
+        Both results are read in one burst, so they belong together; waits
+        for new results do not hold the bus lock.
+
+        Returns:
+            float: Scaled pressure
+            float: Scaled temperature
+        """
+        with self.lock:
+            self._checkResetIfDue()
+            if self.__switched:
+                self.__waitSwitched()
+            raw_p, raw_t = self._readRawResults()
+        return raw_p / self.__kP, raw_t / self.__kT
@@ -0,0 +1,163 @@
+"""DPS310 / DPS368 register map and compensation.
+"""
+
+from time import monotonic
+
+from .core import DPSCore, getTwosComplement
+from .types import Coefficients, Sample
+
+
+class DPS(DPSCore):
+    """Class of DPS, Pressure and Temperature sensor (DPS310, DPS368).
+    """
+
+    # Capacity of the result FIFO (pressure and temperature entries)
+    FIFO_SIZE = 32
+
+    # PRODUCT_ID register, mask and value (REV_ID 1, PROD_ID 0)
+    PRODUCT_ID = (0x0D, 0xFF, 0x10)
+
+    __coefficients = None
+    __fifo_t = None
+
+    def __getPressureCalibrationCoefficients(self):
+        """Get pressure calibration coefficients from sensor.
+
+        Returns:
+            int: Pressure calibration coefficient (c00)
+            int: Pressure calibration coefficient (c10)
+            int: Pressure calibration coefficient (c20)
+            int: Pressure calibration coefficient (c30)
+            int: Pressure calibration coefficient (c01)
+            int: Pressure calibration coefficient (c11)
+            int: Pressure calibration coefficient (c21)
+        """
+        (src13, src14, src15, src16, src17, src18, src19, src1A,
+         src1B, src1C, src1D, src1E, src1F, src20, src21) = self._readRegisters(0x13, 15)
+
+        c00 = (src13 << 12) | (src14 << 4) | (src15 >> 4)
+        c00 = getTwosComplement(c00, 20)
+
+        c10 = ((src15 & 0x0F) << 16) | (src16 << 8) | src17
+        c10 = getTwosComplement(c10, 20)
+
+        c20 = (src1C << 8) | src1D
+        c20 = getTwosComplement(c20, 16)
+
+        c30 = (src20 << 8) | src21
+        c30 = getTwosComplement(c30, 16)
+
+        c01 = (src18 << 8) | src19
+        c01 = getTwosComplement(c01, 16)
+
+        c11 = (src1A << 8) | src1B
+        c11 = getTwosComplement(c11, 16)
+
+        c21 = (src1E << 8) | src1F
+        c21 = getTwosComplement(c21, 16)
+
+        return c00, c10, c20, c30, c01, c11, c21
+
+    def __getTemperatureCalibrationCoefficients(self):
+        """Get temperature calibration coefficients from sensor.
+
+        Returns:
+            int: Temperature calibration coefficient (c0)
+            int: Temperature calibration coefficient (c1)
+        """
+        src10, src11, src12 = self._readRegisters(0x10, 3)
+
+        c0 = (src10 << 4) | (src11 >> 4)
+        c0 = getTwosComplement(c0, 12)
+
+        c1 = ((src11 & 0x0F) << 8) | src12
+        c1 = getTwosComplement(c1, 12)
+
+        return c0, c1
+
+    def getCoefficients(self):
+        """Get the calibration coefficients.
+
+        They are read from the sensor on the first call and cached.
+
+        Returns:
+            Coefficients: c0, c1, c00, c10, c20, c30, c01, c11, c21
+        """
+        with self.lock:
+            if self.__coefficients is None:
+                self.__coefficients = Coefficients(*self.__getTemperatureCalibrationCoefficients(),
+                                                   *self.__getPressureCalibrationCoefficients())
+            return self.__coefficients
+
+    def calcCompTemperature(self, scaled_t):
+        """Calculate compensated temperature.
+
+        Args:
+            scaled_t (float): Scaled temperature
+
+        Returns:
+            float: Compensated temperature [C]
+        """
+        c = self.getCoefficients()
+        comp_t = c.c0 * 0.5 + scaled_t * c.c1
+        return comp_t
+
+    def calcCompPressure(self, scaled_p, scaled_t):
+        """Calculate compensated pressure.
+
+        Args:
+            scaled_p (float): Scaled pressure
+            scaled_t (float): Scaled temperature
+
+        Returns:
+            float: Compensated pressure [Pa]
+        """
+        c0, c1, c00, c10, c20, c30, c01, c11, c21 = self.getCoefficients()
+        comp_p = (c00 + scaled_p * (c10 + scaled_p * (c20 + scaled_p * c30))
+                  + scaled_t * (c01 + scaled_p * (c11 + scaled_p * c21)))
+        return comp_p
+
+    def readFifo(self):
+        """Drain the result FIFO.
+
+        Requires `configure(..., fifo=True)`. Pressure entries are paired with
+        the latest temperature entry and timestamped on the sensor's sample
+        grid, the newest one like `measureSample()`.
+
+        Returns:
+            list: Samples, oldest first
+            bool: True if the FIFO was full, so results may have been lost
+        """
+        with self.lock:
+            if self._checkResetIfDue():
+                # Entries read before the reset was detected are zeros
+                self.__fifo_t = None
+                return [], False
+            with self.bus_lock:
+                full = bool(self._readRegisters(0x0B, 1)[0] & 0x02)
+                now = monotonic()
+                raw = []
+                for _ in range(self.FIFO_SIZE):
+                    b2, b1, b0 = self._readRegisters(0x00, 3)
+                    value = (b2 << 16) | (b1 << 8) | b0
+                    if value == 0x800000:
+                        # FIFO empty
+                        break
+                    raw.append(value)
+
+            pairs = []
+            for value in raw:
+                # The LSB tells pressure (1) from temperature (0) entries
+                if value & 0x01:
+                    if self.__fifo_t is not None:
+                        pairs.append((getTwosComplement(value, 24), self.__fifo_t))
+                else:
+                    self.__fifo_t = getTwosComplement(value, 24)
+
+            period = self.getSamplePeriod()
+            newest = now - period / 2 - self.getConversionTime() / 2
+            samples = []
+            for i, (raw_p, raw_t) in enumerate(pairs):
+                temperature, pressure = self._compensate(raw_p, raw_t)
+                samples.append(Sample(newest - (len(pairs) - 1 - i) * period, pressure, temperature))
+            return samples, full
@@ -0,0 +1,204 @@
+"""DPS422 register map and compensation.
+"""
+
+from array import array
+
+from .core import DPSCore, getTwosComplement
+from .types import Coefficients422
+
+
+class DPS422(DPSCore):
+    """Class of DPS422, Pressure and Temperature sensor.
+    """
+
+    DPS422_A_0 = 5030
+    DPS422_T_REF = 27
+    DPS422_T_C_VBE = -1.735e-3
+    DPS422_V_BE_TARGET = 0.687027
+    DPS422_K_PTAT_CORNER = -0.8
+    DPS422_K_PTAT_CURVATURE = 0.039
+    DPS422_ALPHA = 9.45
+
+    # PRODUCT_ID register, mask and value (PROD_ID, any REV_ID)
+    PRODUCT_ID = (0x1D, 0x0F, 0x0A)
+
+    __coefficients = None
+
+    def __getPressureCalibrationCoefficients(self):
+        """Get pressure calibration coefficients from sensor.
+
+        Returns:
+            int: Pressure calibration coefficient (c00)
+            int: Pressure calibration coefficient (c01)
+            int: Pressure calibration coefficient (c02)
+            int: Pressure calibration coefficient (c10)
+            int: Pressure calibration coefficient (c11)
+            int: Pressure calibration coefficient (c12)
+            int: Pressure calibration coefficient (c20)
+            int: Pressure calibration coefficient (c21)
+            int: Pressure calibration coefficient (c30)
+        """
+        (src26, src27, src28, src29, src2A, src2B, src2C, src2D, src2E, src2F,
+         src30, src31, src32, src33, src34, src35, src36, src37, src38, src39) = self._readRegisters(0x26, 20)
+
+        c00 = (src26 << 12) | (src27 << 4) | (src28 >> 4)
+        c10 = ((src28 & 0x0F) << 16) | (src29 << 8) | src2A
+        c01 = (src2B << 12) | (src2C << 4) | ((src2D & 0xF0) >> 4)
+        c02 = ((src2D & 0x0F) << 16) | (src2E << 8) | src2F
+        c20 = ((src30 & 0x7F) << 8) | src34
+        c30 = ((src32 & 0x0F) << 8) | src33
+        c11 = (src34 << 9) | (src35 << 1) | ((src36 & 0x80) >> 7)
+        c12 = ((src36 & 0x7F) << 10) | (src37 << 2) | ((src38 & 0xC0) >> 6)
+        c21 = ((src38 & 0x7F) << 8) | src39
+
+        c00 = getTwosComplement(c00, 20)
+        c01 = getTwosComplement(c01, 20)
+        c02 = getTwosComplement(c02, 20)
+        c10 = getTwosComplement(c10, 20)
+        c11 = getTwosComplement(c11, 17)
+        c12 = getTwosComplement(c12, 17)
+        c20 = getTwosComplement(c20, 15)
+        c21 = getTwosComplement(c21, 14)
+        c30 = getTwosComplement(c30, 12)
+
+        return c00, c01, c02, c10, c11, c12, c20, c21, c30
+
+    def __getTemperatureCalibrationCoefficients(self):
+        """Get temperature calibration coefficients from sensor.
+
+        Returns:
+            float : Temperature calibration coefficient (a_prime)
+            float : Temperature calibration coefficient (b_prime)
+        """
+        #read T_Gain, T_Vbe and T_dVbe
+        T_Gain, T_dVBE_Coeff, T_VBE_Coeff = self._readRegisters(0x20, 3)
+
+        T_dVbe = T_dVBE_Coeff >> 1
+        T_Vbe = (T_dVBE_Coeff & 0x01) | (T_VBE_Coeff << 1)
+
+        T_Gain = getTwosComplement(T_Gain, 8)
+        T_dVbe = getTwosComplement(T_dVbe, 7)
+        T_Vbe = getTwosComplement(T_Vbe, 9)
+
+        #Vbe, dVbe and Aadc
+        Vbe = T_Vbe * 1.05031e-4 + 0.463232422
+        dVbe = T_dVbe * 1.25885e-5 + 0.04027621
+        Aadc = T_Gain * 8.4375e-5 + 0.675
+        #Vbe_cal and dVbe_cal
+        Vbe_cal = Vbe / Aadc
+        dVbe_cal = dVbe / Aadc
+        #T_calib
+        T_calib = DPS422.DPS422_A_0 * dVbe_cal - 273.15
+        #Vbe_cal(T_ref): Vbe value at reference temperature
+        Vbe_cal_tref = Vbe_cal - (T_calib - DPS422.DPS422_T_REF) * DPS422.DPS422_T_C_VBE
+        #calculate PTAT correction coefficient
+        k_ptat = (DPS422.DPS422_V_BE_TARGET - Vbe_cal_tref) * DPS422.DPS422_K_PTAT_CORNER + DPS422.DPS422_K_PTAT_CURVATURE
+        #calculate A_Prime and B_Prime
+        a_prime = DPS422.DPS422_A_0 * (Vbe_cal + DPS422.DPS422_ALPHA * dVbe_cal) * (1 + k_ptat)
+        b_prime = -273.15 * (1 + k_ptat) - k_ptat * T_calib
+
+        return a_prime, b_prime
+
+    def getCoefficients(self):
+        """Get the calibration coefficients.
+
+        They are read from the sensor on the first call and cached.
+
+        Returns:
+            Coefficients422: a_prime, b_prime, c00, c01, c02, c10, c11, c12,
+                c20, c21, c30
+        """
+        with self.lock:
+            if self.__coefficients is None:
+                self.__coefficients = Coefficients422(*self.__getTemperatureCalibrationCoefficients(),
+                                                      *self.__getPressureCalibrationCoefficients())
+            return self.__coefficients
+
+    def calcCompTemperature(self, scaled_t):
+        """Calculate compensated temperature.
+
+        Args:
+            scaled_t (float): Scaled temperature
+
+        Returns:
+            float: Compensated temperature [C]
+        """
+        c = self.getCoefficients()
+        u = scaled_t / (1 + DPS422.DPS422_ALPHA * scaled_t)
+        return (c.a_prime * u + c.b_prime)
+
+    def calcCompPressure(self, scaled_p, scaled_t):
+        """Calculate compensated pressure.
+
+        Args:
+            scaled_p (float): Scaled pressure
+            scaled_t (float): Scaled temperature
+
+        Returns:
+            float: Compensated pressure [Pa]
+        """
+        temp = (8.5 * scaled_t) / (1 + 8.8 * scaled_t)
+        return _pressurePolynomial(self.getCoefficients(), scaled_p, temp)
+
+    def _compensateScaled(self, scaled_p, scaled_t):
+        """Compensate scaled results with one coefficient lookup.
+
+        Works element-wise on NumPy arrays as well.
+
+        Args:
+            scaled_p (float): Scaled pressure
+            scaled_t (float): Scaled temperature
+
+        Returns:
+            float: Compensated temperature [C]
+            float: Compensated pressure [Pa]
+        """
+        c = self.getCoefficients()
+        u = scaled_t / (1 + DPS422.DPS422_ALPHA * scaled_t)
+        temp = (8.5 * scaled_t) / (1 + 8.8 * scaled_t)
+        return c.a_prime * u + c.b_prime, _pressurePolynomial(c, scaled_p, temp)
+
+    def _compensateScaledBatch(self, scaled_p, scaled_t):
+        """Compensate lists of scaled results.
+
+        The loop keeps the coefficients in local variables and inlines the
+        temperature terms and the pressure polynomial.
+
+        Args:
+            scaled_p (list): Scaled pressures
+            scaled_t (list): Scaled temperatures
+
+        Returns:
+            array: Compensated temperatures [C]
+            array: Compensated pressures [Pa]
+        """
+        a_prime, b_prime, c00, c01, c02, c10, c11, c12, c20, c21, c30 = self.getCoefficients()
+        alpha = DPS422.DPS422_ALPHA
+        temperatures = array('d')
+        pressures = array('d')
+        for p, t in zip(scaled_p, scaled_t):
+            temperatures.append(a_prime * t / (1 + alpha * t) + b_prime)
+            temp = (8.5 * t) / (1 + 8.8 * t)
+            pressures.append(c00 + temp * (c01 + temp * c02)
+                             + p * (c10 + temp * (c11 + temp * c12)
+                                    + p * (c20 + temp * c21 + p * c30)))
+        return temperatures, pressures
+
+
+def _pressurePolynomial(c, scaled_p, temp):
+    """Evaluate the DPS422 pressure polynomial.
+
+    Horner form in `scaled_p`, with the temperature-dependent coefficients
+    evaluated first.
+
+    Args:
+        c (Coefficients422): Calibration coefficients
+        scaled_p (float): Scaled pressure
+        temp (float): Temperature term 8.5 t / (1 + 8.8 t)
+
+    Returns:
+        float: Compensated pressure [Pa]
+    """
+    return (c.c00 + temp * (c.c01 + temp * c.c02)
+            + scaled_p * (c.c10 + temp * (c.c11 + temp * c.c12)
+                          + scaled_p * (c.c20 + temp * c.c21 + scaled_p * c.c30)))
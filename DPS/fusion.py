@@ -0,0 +1,120 @@
+"""Several physical sensors behind one virtual sensor.
+
+Averaging N sensors lowers the noise by about sqrt(N), so N sensors at low
+oversampling reach the noise floor of one sensor at high oversampling in a
+fraction of the conversion time: four sensors at 8 times oversampling
+(0.4 Pa each, 2 x 14.8 ms per reading) match one at 64 times (0.2 Pa,
+2 x 104.4 ms).
+
+`FusedSensor` triggers its sensors together (see `DPS.sync`), removes each
+sensor's learned offset from the group, and returns the inverse-variance
+weighted average through the same `measureSample()` API as a single `DPS`.
+The standard error of the latest average is kept in `uncertainty`.
+"""
+
+import math
+
+from .power import PRESSURE_NOISE
+from .sync import SyncGroup
+from .types import Sample
+
+
+class FusedSensor:
+    """Weighted average of several sensors with offset learning.
+
+    Offsets are exponential moving averages of each sensor's deviation from
+    the group mean, so they sum to about zero and the fused value stays at
+    the group mean. Weights are the inverses of exponential moving averages
+    of each sensor's squared residual around the fused value, starting from
+    the typical noise of the oversampling rate.
+    """
+
+    def __init__(self, sensors, oversampling=8, learning_rate=0.01):
+        """Initial setting.
+
+        Puts every sensor into command mode at `oversampling`.
+
+        Args:
+            sensors (list): DPS or DPS422 sensors, at least two
+            oversampling (int): Oversampling rate of every sensor, 1 to 128
+            learning_rate (float): Weight of a new reading in the offset and
+                noise estimates, 0 to freeze them
+        """
+        if len(sensors) < 2:
+            raise ValueError('fusing needs at least two sensors')
+        self.group = SyncGroup(sensors, oversampling)
+        self.sensors = self.group.sensors
+        self.learning_rate = learning_rate
+        n = len(self.sensors)
+        noise = PRESSURE_NOISE[oversampling.bit_length() - 1]
+        self.pressure_offsets = [0.0] * n
+        self.temperature_offsets = [0.0] * n
+        self.variances = [noise * noise] * n
+        # Keeps one sensor from taking all the weight by chance
+        self.__min_variance = (0.1 * noise) ** 2
+        self.uncertainty = None
+        self.spread = None
+
+    def measureSample(self, fresh=False):
+        """Measure all sensors and fuse the results.
+
+        Args:
+            fresh (bool): Ignored, every reading is a new conversion
+
+        Returns:
+            Sample: (mean timestamp, fused pressure [Pa], fused temperature [C])
+        """
+        batch, self.spread = self.group.measure()
+        n = len(batch)
+        pressures = batch.pressures
+        temperatures = batch.temperatures
+        mean_p = sum(pressures) / n
+        mean_t = sum(temperatures) / n
+        rate = self.learning_rate
+        p_offsets = self.pressure_offsets
+        t_offsets = self.temperature_offsets
+        variances = self.variances
+
+        corrected = [p - offset for p, offset in zip(pressures, p_offsets)]
+        weights = [1.0 / v for v in variances]
+        total = sum(weights)
+        pressure = sum(w * p for w, p in zip(weights, corrected)) / total
+        temperature = mean_t - sum(t_offsets) / n
+        self.uncertainty = math.sqrt(1.0 / total)
+
+        for i in range(n):
+            p_offsets[i] += rate * ((pressures[i] - mean_p) - p_offsets[i])
+            t_offsets[i] += rate * ((temperatures[i] - mean_t) - t_offsets[i])
+            residual = corrected[i] - pressure
+            variances[i] = max(self.__min_variance,
+                               variances[i] + rate * (residual * residual - variances[i]))
+        return Sample(sum(batch.timestamps) / n, pressure, temperature)
+
+    def getSamplePeriod(self):
+        """Get the time one fused reading takes.
+
+        Returns:
+            float: Temperature and pressure conversion time [s]
+        """
+        return 2 * max(sensor.getConversionTime() for sensor in self.sensors)
+
+    def getConversionTime(self):
+        """Get the conversion time of one pressure measurement.
+
+        Returns:
+            float: Longest conversion time of the sensors [s]
+        """
+        return max(sensor.getConversionTime() for sensor in self.sensors)
+
+    def getStats(self):
+        """Get bus and recovery counters summed over the sensors.
+
+        Returns:
+            dict: Counts of bus errors, retries, failed transactions and
+                reinitializations
+        """
+        total = {}
+        for sensor in self.sensors:
+            for key, value in sensor.getStats().items():
+                total[key] = total.get(key, 0) + value
+        return total
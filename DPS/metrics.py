@@ -0,0 +1,221 @@
+"""Prometheus / OpenMetrics exporter.
+
+`MetricsExporter` samples its sensors in background threads and serves
+``/metrics`` over HTTP on localhost, using only the standard library. A
+scrape renders the text from `SensorMetrics` state that the samplers keep
+up to date, so it takes microseconds and never touches the bus.
+
+Metrics, labelled with ``sensor``:
+
+* ``dps_pressure_pascals``, ``dps_temperature_celsius``: latest sample
+* ``dps_sample_timestamp_seconds``: its time.monotonic timestamp
+* ``dps_sample_rate_hertz``: achieved sample rate
+* ``dps_samples_total``, ``dps_read_errors_total``: samples read, failed reads
+* ``dps_bus_errors_total``, ``dps_bus_retries_total``,
+  ``dps_reinits_total``: driver counters, see `DPS.getStats()`
+
+    exporter = MetricsExporter([DPS(1, 0x77)], ('127.0.0.1', 9464), names=['0x77'])
+    exporter.serveForever()
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .stream import sampleStream
+
+
+OPENMETRICS_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+PROMETHEUS_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# (name, type, help, SensorMetrics state index or getStats() key)
+_METRICS = (
+    ('dps_pressure_pascals', 'gauge', 'Latest pressure.', 1),
+    ('dps_temperature_celsius', 'gauge', 'Latest temperature.', 2),
+    ('dps_sample_timestamp_seconds', 'gauge', 'Timestamp of the latest sample (time.monotonic).', 0),
+    ('dps_sample_rate_hertz', 'gauge', 'Achieved sample rate.', 4),
+    ('dps_samples', 'counter', 'Samples read.', 3),
+    ('dps_read_errors', 'counter', 'Sensor reads that failed after all retries.', 5),
+    ('dps_bus_errors', 'counter', 'Failed bus transactions, including retried ones.', 'bus_errors'),
+    ('dps_bus_retries', 'counter', 'Retried bus transactions.', 'retries'),
+    ('dps_reinits', 'counter', 'Reinitializations after a sensor reset.', 'reinits'),
+)
+
+
+class SensorMetrics:
+    """Pre-aggregated metrics of one sensor.
+
+    `update()` replaces `state` with a new tuple in one assignment, so a
+    scrape in another thread always sees a consistent set of values.
+    """
+
+    def __init__(self, sensor, name, smoothing=0.1):
+        """Initial setting.
+
+        Args:
+            sensor (DPS or DPS422): Sensor providing `getStats()`
+            name (str): Value of the ``sensor`` label
+            smoothing (float): Weight of a new interval in the rate average
+        """
+        self.sensor = sensor
+        self.name = name
+        self.smoothing = smoothing
+        # timestamp, pressure, temperature, samples, rate, read errors
+        self.state = (float('nan'), float('nan'), float('nan'), 0, 0.0, 0)
+        self.__interval = None
+
+    def update(self, sample):
+        """Record a sample.
+
+        Args:
+            sample (tuple): (timestamp, pressure, temperature)
+        """
+        timestamp, pressure, temperature = sample
+        last, _, _, count, rate, errors = self.state
+        if count:
+            interval = timestamp - last
+            if self.__interval is None:
+                self.__interval = interval
+            else:
+                self.__interval += self.smoothing * (interval - self.__interval)
+            if self.__interval > 0:
+                rate = 1.0 / self.__interval
+        self.state = (timestamp, pressure, temperature, count + 1, rate, errors)
+
+    def error(self):
+        """Record a failed read.
+        """
+        state = self.state
+        self.state = state[:5] + (state[5] + 1,)
+
+
+def _formatValue(value):
+    if value != value:
+        return 'NaN'
+    return repr(value)
+
+
+def _escapeLabel(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def renderMetrics(metrics, openmetrics=True):
+    """Render the exposition text.
+
+    Args:
+        metrics (list): `SensorMetrics`
+        openmetrics (bool): OpenMetrics format, else Prometheus text 0.0.4
+
+    Returns:
+        bytes: Exposition text
+    """
+    snapshots = [(_escapeLabel(m.name), m.state, m.sensor.getStats()) for m in metrics]
+    lines = []
+    for name, kind, text, key in _METRICS:
+        sample_name = name + '_total' if kind == 'counter' else name
+        lines.append('# HELP %s %s' % (name if openmetrics else sample_name, text))
+        lines.append('# TYPE %s %s' % (name if openmetrics else sample_name, kind))
+        for label, state, stats in snapshots:
+            value = state[key] if isinstance(key, int) else stats.get(key, 0)
+            lines.append('%s{sensor="%s"} %s' % (sample_name, label, _formatValue(value)))
+    if openmetrics:
+        lines.append('# EOF')
+    lines.append('')
+    return '\n'.join(lines).encode()
+
+
+class _MetricsSampler(threading.Thread):
+    """Background thread feeding one `SensorMetrics`.
+    """
+
+    def __init__(self, metrics, interval, stop):
+        super().__init__(daemon=True)
+        self.metrics = metrics
+        self.interval = interval
+        self.stop = stop
+
+    def run(self):
+        while not self.stop.is_set():
+            try:
+                for sample in sampleStream(self.metrics.sensor, self.interval, stop=self.stop):
+                    self.metrics.update(sample)
+            except OSError:
+                self.metrics.error()
+                self.stop.wait(self.interval or 1.0)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+        openmetrics = 'application/openmetrics-text' in self.headers.get('Accept', '')
+        body = renderMetrics(self.server.metrics, openmetrics)
+        self.send_response(200)
+        self.send_header('Content-Type', OPENMETRICS_TYPE if openmetrics else PROMETHEUS_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MetricsExporter:
+    """Serve sensor and driver metrics for Prometheus on localhost.
+    """
+
+    def __init__(self, sensors, address=('127.0.0.1', 9464), interval=1.0, names=None,
+                 sample=True):
+        """Initial setting.
+
+        Args:
+            sensors (list): `DPS` / `DPS422` instances
+            address (tuple): (host, port) to listen on
+            interval (float): Sampling interval [s], None for the sensor's
+                own rate
+            names (list): ``sensor`` label per sensor, None for the indices
+            sample (bool): Sample in background threads; False if another
+                loop feeds `metrics[i].update()` instead
+        """
+        if names is None:
+            names = [str(i) for i in range(len(sensors))]
+        self.metrics = [SensorMetrics(s, n) for s, n in zip(sensors, names)]
+        self.interval = interval
+        self.sample = sample
+        self.__stop = threading.Event()
+        self.samplers = []
+        self.server = ThreadingHTTPServer(address, _MetricsHandler)
+        self.server.daemon_threads = True
+        self.server.metrics = self.metrics
+        self.address = self.server.server_address
+        self.__serving = False
+
+    def __startSampling(self):
+        if self.sample:
+            self.samplers = [_MetricsSampler(m, self.interval, self.__stop) for m in self.metrics]
+            for sampler in self.samplers:
+                sampler.start()
+
+    def start(self):
+        """Start sampling and serve scrapes in a background thread.
+        """
+        self.__startSampling()
+        self.__serving = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def serveForever(self):
+        """Start sampling and serve scrapes in the calling thread.
+        """
+        self.__startSampling()
+        self.__serving = True
+        self.server.serve_forever()
+
+    def close(self):
+        """Stop sampling and serving.
+        """
+        self.__stop.set()
+        if self.__serving:
+            # shutdown() waits for serve_forever(), so only once it runs
+            self.server.shutdown()
+        self.server.server_close()
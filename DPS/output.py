@@ -0,0 +1,225 @@
+"""Unit conversion and batched serialization of sample streams.
+
+`SampleWriter` converts samples to the configured units and writes them in
+batches: CSV lines, JSON Lines or packed little-endian doubles. Unit
+conversion is an affine transform (scale, offset) per column, picked once
+from `PRESSURE_UNITS` / `TEMPERATURE_UNITS`. Text formats render a whole
+batch with a single bytes format operation on a template built once for
+full batches; the binary format packs a batch into a preallocated buffer.
+Every batch is one `write()` call. An optional sensor column interleaves
+several sensors in one output, as `dps-acquire` does.
+
+    with open('log.csv', 'wb') as f, SampleWriter(f, 'csv', 'hPa', 'F') as writer:
+        writeStream(sampleStream(sensor, 1.0), writer)
+"""
+
+import struct
+from array import array
+
+from .types import SampleBatch
+
+
+# (scale, offset) from Pa / C to the unit
+PRESSURE_UNITS = {
+    'Pa': (1.0, 0.0),
+    'hPa': (0.01, 0.0),
+    'mbar': (0.01, 0.0),
+    'kPa': (0.001, 0.0),
+    'bar': (1e-5, 0.0),
+    'psi': (1 / 6894.757293168, 0.0),
+    'mmHg': (1 / 133.322387415, 0.0),
+    'inHg': (1 / 3386.388640341, 0.0),
+    'atm': (1 / 101325.0, 0.0),
+}
+TEMPERATURE_UNITS = {
+    'C': (1.0, 0.0),
+    'F': (1.8, 32.0),
+    'K': (1.0, 273.15),
+}
+
+FORMATS = ('csv', 'jsonl', 'text', 'binary')
+
+# Binary records, little-endian: (timestamp, pressure, temperature), with
+# the sensor ID in front if the writer has a sensor column
+RECORD = struct.Struct('<ddd')
+SENSOR_RECORD = struct.Struct('<Bddd')
+
+
+class SampleWriter:
+    """Batched, unit-converting sample writer.
+    """
+
+    def __init__(self, f, format='csv', pressure_unit='Pa', temperature_unit='C',
+                 precision=(6, 2, 3), batch_size=256, header=True, sensor=False):
+        """Initial setting.
+
+        Args:
+            f (file): Binary file
+            format (str): 'csv', 'jsonl', 'text' (one readable line per
+                sample) or 'binary' (`RECORD` / `SENSOR_RECORD`)
+            pressure_unit (str): Key of `PRESSURE_UNITS`
+            temperature_unit (str): Key of `TEMPERATURE_UNITS`
+            precision (tuple): Decimal places of timestamp, pressure and
+                temperature in text formats
+            batch_size (int): Samples per write
+            header (bool): Start a CSV file with a header line
+            sensor (bool): Add a sensor column, e.g. the I2C address; `write()`
+                and `writeBatch()` then take the sensor ID (0 to 255), written
+                in hex in text formats
+        """
+        if format not in FORMATS:
+            raise ValueError('format must be one of %s, not %r' % (', '.join(FORMATS), format))
+        if pressure_unit not in PRESSURE_UNITS:
+            raise ValueError('unknown pressure unit %r' % pressure_unit)
+        if temperature_unit not in TEMPERATURE_UNITS:
+            raise ValueError('unknown temperature unit %r' % temperature_unit)
+        self.f = f
+        self.format = format
+        self.batch_size = batch_size
+        self.sensor = sensor
+        self.__p_scale, self.__p_offset = PRESSURE_UNITS[pressure_unit]
+        self.__t_scale, self.__t_offset = TEMPERATURE_UNITS[temperature_unit]
+        self.__columns = 4 if sensor else 3
+        self.__pending = SampleBatch()
+        self.__sensors = array('B')
+        self.__values = [0.0] * (self.__columns * batch_size)
+        self.__full = None
+        if format == 'binary':
+            self.__buffer = bytearray((SENSOR_RECORD if sensor else RECORD).size * batch_size)
+            self.__line = None
+            return
+        digits_ts, digits_p, digits_t = precision
+        if format == 'csv':
+            prefix = '%#04x,'
+            line = '%%.%df,%%.%df,%%.%df\n' % (digits_ts, digits_p, digits_t)
+            if header:
+                f.write(('%stimestamp,pressure_%s,temperature_%s\n'
+                         % ('sensor,' if sensor else '', pressure_unit, temperature_unit)).encode())
+        elif format == 'jsonl':
+            prefix = '{"sensor":"%#04x",'
+            line = ('{"timestamp":%%.%df,"pressure":%%.%df,"temperature":%%.%df}\n'
+                    % (digits_ts, digits_p, digits_t))
+        else:
+            prefix = '%#04x '
+            line = ('%%.%df s %%.%df %s %%.%df %s\n'
+                    % (digits_ts, digits_p, pressure_unit, digits_t, temperature_unit))
+        if sensor:
+            line = prefix + line[1:] if format == 'jsonl' else prefix + line
+        # bytes %-formatting renders a batch without a str to encode
+        self.__line = line.encode()
+
+    def convert(self, sample):
+        """Convert one sample to the configured units.
+
+        Args:
+            sample (tuple): (timestamp, pressure [Pa], temperature [C])
+
+        Returns:
+            tuple: (timestamp, pressure, temperature) in the configured units
+        """
+        timestamp, pressure, temperature = sample
+        return (timestamp, pressure * self.__p_scale + self.__p_offset,
+                temperature * self.__t_scale + self.__t_offset)
+
+    def write(self, sample, sensor=0):
+        """Queue one sample, writing a batch when `batch_size` are queued.
+
+        Args:
+            sample (tuple): (timestamp, pressure [Pa], temperature [C])
+            sensor (int): Sensor ID, if the writer has a sensor column
+        """
+        self.__pending.append(sample)
+        self.__sensors.append(sensor)
+        if len(self.__pending) >= self.batch_size:
+            self.__writePending()
+
+    def writeBatch(self, batch, sensor=0):
+        """Write a batch of samples, together with any queued ones.
+
+        Args:
+            batch (SampleBatch or iterable): Samples
+            sensor (int): Sensor ID of all samples, if the writer has a
+                sensor column
+        """
+        if not isinstance(batch, SampleBatch):
+            batch = SampleBatch(batch)
+        self.flush()
+        for start in range(0, len(batch), self.batch_size):
+            part = batch[start:start + self.batch_size]
+            self.__writeColumns(part, array('B', [sensor]) * len(part))
+
+    def flush(self):
+        """Write the queued samples and flush the file.
+        """
+        if self.__pending:
+            self.__writePending()
+        self.f.flush()
+
+    def close(self):
+        """Write the queued samples; the file stays open.
+        """
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __writePending(self):
+        self.__writeColumns(self.__pending, self.__sensors)
+        self.__pending.clear()
+        del self.__sensors[:]
+
+    def __writeColumns(self, batch, sensors):
+        n = len(batch)
+        k = self.__columns
+        values = self.__values if n == self.batch_size else [0.0] * (k * n)
+        p_scale, p_offset = self.__p_scale, self.__p_offset
+        t_scale, t_offset = self.__t_scale, self.__t_offset
+        if self.sensor:
+            values[0::k] = sensors
+        values[k - 3::k] = batch.timestamps
+        values[k - 2::k] = [p * p_scale + p_offset for p in batch.pressures]
+        values[k - 1::k] = [t * t_scale + t_offset for t in batch.temperatures]
+        if self.__line is None:
+            packer = self.__template(n)
+            packer.pack_into(self.__buffer, 0, *values)
+            self.f.write(memoryview(self.__buffer)[:packer.size])
+        else:
+            self.f.write(self.__template(n) % tuple(values))
+
+    def __template(self, n):
+        # Full batches reuse one template, partial ones build their own
+        if n == self.batch_size and self.__full is not None:
+            return self.__full
+        if self.__line is None:
+            template = struct.Struct('<' + ('Bddd' if self.sensor else 'ddd') * n)
+        else:
+            template = self.__line * n
+        if n == self.batch_size:
+            self.__full = template
+        return template
+
+
+def writeStream(samples, writer, stop=None):
+    """Write a sample stream through a writer.
+
+    Args:
+        samples (iterable): (timestamp, pressure, temperature) tuples
+        writer (SampleWriter): Writer
+        stop (threading.Event): Ends writing when set
+
+    Returns:
+        int: Number of samples written
+    """
+    n = 0
+    try:
+        for sample in samples:
+            writer.write(sample)
+            n += 1
+            if stop is not None and stop.is_set():
+                break
+    finally:
+        writer.flush()
+    return n
@@ -0,0 +1,82 @@
+"""Polling several sensors from worker threads.
+
+Sensor objects are thread-safe (see `DPSCore`), so any executor can call
+them. `measureAll` submits one `measureSample()` per sensor to an executor
+and collects the results in sensor order; `SensorPool` owns a thread pool
+sized for its sensors. Sensors on different buses measure in parallel,
+sensors on one bus interleave between complete register transactions, and
+waits for results do not block other sensors.
+
+    with SensorPool([DPS(1, 0x77), DPS(1, 0x76), DPS(3, 0x77)]) as pool:
+        samples = pool.measure(fresh=True)
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+
+def measureAll(executor, sensors, fresh=False):
+    """Measure a sample of every sensor concurrently.
+
+    Args:
+        executor (concurrent.futures.Executor): Thread pool to run on
+        sensors (list): DPS or DPS422 sensors
+        fresh (bool): Wait for new pressure results, see `measureSample()`
+
+    Returns:
+        list: Samples in the order of `sensors`
+
+    Raises:
+        OSError: Bus error of a sensor
+    """
+    futures = [executor.submit(sensor.measureSample, fresh) for sensor in sensors]
+    return [future.result() for future in futures]
+
+
+class SensorPool:
+    """Thread pool polling a fixed set of sensors.
+    """
+
+    def __init__(self, sensors, max_workers=None):
+        """Initial setting.
+
+        Args:
+            sensors (list): DPS or DPS422 sensors
+            max_workers (int): Worker threads, None for one per sensor
+        """
+        self.sensors = list(sensors)
+        self.executor = ThreadPoolExecutor(max_workers or len(self.sensors) or 1,
+                                           thread_name_prefix='dps')
+
+    def submit(self, func, *args):
+        """Run a call on a worker thread.
+
+        Args:
+            func (callable): E.g. a bound sensor method
+            *args: Arguments of `func`
+
+        Returns:
+            concurrent.futures.Future: Result of the call
+        """
+        return self.executor.submit(func, *args)
+
+    def measure(self, fresh=False):
+        """Measure a sample of every sensor concurrently.
+
+        Args:
+            fresh (bool): Wait for new pressure results, see `measureSample()`
+
+        Returns:
+            list: Samples in the order of `sensors`
+        """
+        return measureAll(self.executor, self.sensors, fresh)
+
+    def close(self):
+        """Wait for running calls and stop the worker threads.
+        """
+        self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
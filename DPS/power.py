@@ -0,0 +1,138 @@
+"""Power-aware duty cycling for battery powered nodes.
+
+`planPower` picks the oversampling rate and measurement mode with the lowest
+average current that still meets a reporting interval, a pressure noise
+target and a latency target. `DutyCycleScheduler` applies the plan and reads
+one sample per interval; in command mode the sensor sits in standby between
+readings.
+
+The current model uses typical datasheet values: a conversion draws
+`MEASUREMENT_CURRENT` for `CONVERSION_TIMES[oversampling]`, the sensor
+draws `STANDBY_CURRENT` otherwise, and every reading needs one pressure and
+one temperature conversion.
+"""
+
+from collections import namedtuple
+
+from .core import CONVERSION_TIMES
+from .stream import sampleStream
+
+
+# Typical supply current during a conversion and in standby [A]
+MEASUREMENT_CURRENT = 345e-6
+STANDBY_CURRENT = 0.5e-6
+
+# Typical pressure noise [Pa rms], indexed by the oversampling setting
+PRESSURE_NOISE = (2.5, 1.0, 0.5, 0.4, 0.35, 0.3, 0.2, 0.2)
+
+# Background mode measures at least once per second
+MIN_BACKGROUND_RATE = 1
+MAX_BACKGROUND_RATE = 128
+
+
+PowerPlan = namedtuple('PowerPlan', ('background', 'rate', 'oversampling', 'current',
+                                     'charge_per_reading', 'latency', 'noise'))
+PowerPlan.__doc__ = """Measurement configuration chosen by `planPower()`.
+
+background: continuous measurement (True) or command mode (False)
+rate: background measurements per second (1 in command mode)
+oversampling: oversampling rate
+current: estimated average supply current [A]
+charge_per_reading: current * interval [C]
+latency: worst-case time from request to result, or age of the result [s]
+noise: typical pressure noise [Pa rms]
+"""
+
+
+def estimateCurrent(measurements_per_second, oversampling):
+    """Estimate the average supply current of the sensor.
+
+    Args:
+        measurements_per_second (float): Pressure + temperature measurement
+            pairs per second
+        oversampling (int): Oversampling rate, 1 to 128
+
+    Returns:
+        float: Average current [A]
+    """
+    conversion = CONVERSION_TIMES[oversampling.bit_length() - 1]
+    active = min(1.0, measurements_per_second * 2 * conversion)
+    return STANDBY_CURRENT + active * (MEASUREMENT_CURRENT - STANDBY_CURRENT)
+
+
+def planPower(interval, noise=None, latency=None):
+    """Choose the configuration with the lowest current for a reporting interval.
+
+    Args:
+        interval (float): Time between two readings [s]
+        noise (float): Max pressure noise [Pa rms], None for any
+        latency (float): Max time from request to result in command mode,
+            or max age of the result in background mode [s], None for any
+
+    Returns:
+        PowerPlan: Cheapest configuration meeting the targets
+
+    Raises:
+        ValueError: No configuration meets the targets
+    """
+    candidates = []
+    for prc, conversion in enumerate(CONVERSION_TIMES):
+        oversampling = 1 << prc
+        if noise is not None and PRESSURE_NOISE[prc] > noise:
+            continue
+        # Command mode: one temperature and one pressure conversion per reading
+        if 2 * conversion < interval and (latency is None or 2 * conversion <= latency):
+            current = estimateCurrent(1.0 / interval, oversampling)
+            candidates.append(PowerPlan(False, 1, oversampling, current, current * interval,
+                                        2 * conversion, PRESSURE_NOISE[prc]))
+        # Background mode: smallest rate delivering a result every interval
+        rate = MIN_BACKGROUND_RATE
+        while rate < MAX_BACKGROUND_RATE and (rate * interval < 1.0
+                                              or (latency is not None and 1.0 / rate > latency)):
+            rate *= 2
+        if rate * 2 * conversion < 1.0 and (latency is None or 1.0 / rate <= latency):
+            current = estimateCurrent(rate, oversampling)
+            candidates.append(PowerPlan(True, rate, oversampling, current, current * interval,
+                                        1.0 / rate, PRESSURE_NOISE[prc]))
+    if not candidates:
+        raise ValueError('no configuration reaches %s Pa noise and %s s latency every %s s'
+                         % (noise, latency, interval))
+    return min(candidates, key=lambda plan: (plan.current, plan.noise))
+
+
+class DutyCycleScheduler:
+    """Read a sensor once per interval at the lowest estimated current.
+    """
+
+    def __init__(self, sensor, interval, noise=None, latency=None):
+        """Initial setting.
+
+        Args:
+            sensor (DPS or DPS422): Sensor
+            interval (float): Time between two readings [s]
+            noise (float): Max pressure noise [Pa rms], None for any
+            latency (float): Max latency [s], see `planPower()`
+        """
+        self.sensor = sensor
+        self.interval = interval
+        self.plan = planPower(interval, noise, latency)
+
+    def apply(self):
+        """Configure the sensor according to the plan.
+        """
+        self.sensor.configure(self.plan.rate, self.plan.oversampling,
+                              background=self.plan.background)
+
+    def run(self, count=None, stop=None, stats=None):
+        """Apply the plan and read one sample per interval.
+
+        Args:
+            count (int): Number of samples, None for endless
+            stop (threading.Event): Ends the stream when set
+            stats (TimingStats): Updated with every sample
+
+        Yields:
+            Sample: (timestamp, pressure, temperature)
+        """
+        self.apply()
+        yield from sampleStream(self.sensor, self.interval, count, stop, stats=stats)
@@ -0,0 +1,159 @@
+"""Pressure rate-of-change and vertical speed estimation.
+
+`RateEstimator` fits a least-squares line to the last `window` samples of a
+sample stream (see `DPS.stream`) and reports its slope dP/dt together with
+the vertical speed implied by the barometric formula, and the scatter of the
+samples around the line as a noise estimate. Running sums make each update
+O(1).
+"""
+
+import math
+from collections import deque
+
+
+# Molar mass of dry air [kg/mol], gas constant [J/(mol K)], gravity [m/s^2]
+AIR_MOLAR_MASS = 0.0289644
+GAS_CONSTANT = 8.31446
+GRAVITY = 9.80665
+
+
+def verticalSpeed(rate, pressure, temperature):
+    """Convert a pressure rate of change into a vertical speed.
+
+    Args:
+        rate (float): Pressure rate of change [Pa/s]
+        pressure (float): Pressure [Pa]
+        temperature (float): Air temperature [C]
+
+    Returns:
+        float: Vertical speed [m/s], positive upwards
+    """
+    return -rate * GAS_CONSTANT * (temperature + 273.15) / (GRAVITY * AIR_MOLAR_MASS * pressure)
+
+
+class RateEstimator:
+    """Sliding-window least-squares slope of pressure over time.
+
+    By default samples are placed on the time axis by their timestamps. When
+    samples are known to be evenly spaced by the sensor's own clock (e.g.
+    read from the FIFO), pass the configured sample period
+    (`DPS.getSamplePeriod()`) and sample `i` is placed at `i * period`,
+    which removes host timing jitter from the estimate.
+    """
+
+    def __init__(self, window=16, period=None):
+        """Initial setting.
+
+        Args:
+            window (int): Number of samples in the fit (>= 2)
+            period (float): Fixed sample period [s], None to use timestamps
+        """
+        if window < 2:
+            raise ValueError('window must be at least 2 samples')
+        self.window = window
+        self.period = period
+        self.reset()
+
+    def reset(self):
+        """Drop all samples.
+        """
+        self.__points = deque()
+        self.__index = 0
+        self.__origin = None
+        self.__y_origin = 0.0
+        self.__sx = self.__sy = self.__sxx = self.__sxy = self.__syy = 0.0
+        self.__updates = 0
+
+    def __rebase(self):
+        # Re-center x on the oldest sample and recompute the sums, so they
+        # do not lose precision as time grows. Done once per window, so the
+        # cost per update stays O(1) amortized.
+        x0 = self.__points[0][0]
+        self.__origin += x0
+        self.__points = deque((x - x0, y) for x, y in self.__points)
+        self.__sx = sum(x for x, _ in self.__points)
+        self.__sy = sum(y for _, y in self.__points)
+        self.__sxx = sum(x * x for x, _ in self.__points)
+        self.__sxy = sum(x * y for x, y in self.__points)
+        self.__syy = sum(y * y for _, y in self.__points)
+        self.__updates = 0
+
+    def update(self, sample):
+        """Add a sample and get the current estimate.
+
+        Args:
+            sample (tuple): (timestamp, pressure, temperature)
+
+        Returns:
+            float: Pressure rate of change [Pa/s], None until two samples
+            float: Vertical speed [m/s], None until two samples
+        """
+        timestamp, pressure, temperature = sample
+        if self.period is None:
+            t = timestamp
+        else:
+            t = self.__index * self.period
+            self.__index += 1
+        if self.__origin is None:
+            self.__origin = t
+            self.__y_origin = pressure
+        x = t - self.__origin
+        y = pressure - self.__y_origin
+
+        self.__points.append((x, y))
+        self.__sx += x
+        self.__sy += y
+        self.__sxx += x * x
+        self.__sxy += x * y
+        self.__syy += y * y
+        if len(self.__points) > self.window:
+            ox, oy = self.__points.popleft()
+            self.__sx -= ox
+            self.__sy -= oy
+            self.__sxx -= ox * ox
+            self.__sxy -= ox * oy
+            self.__syy -= oy * oy
+        self.__updates += 1
+        if self.__updates >= self.window:
+            self.__rebase()
+
+        n = len(self.__points)
+        denom = n * self.__sxx - self.__sx * self.__sx
+        if n < 2 or denom <= 0.0:
+            return None, None
+        rate = (n * self.__sxy - self.__sx * self.__sy) / denom
+        return rate, verticalSpeed(rate, pressure, temperature)
+
+    def __len__(self):
+        return len(self.__points)
+
+    def noise(self):
+        """Get the scatter of the window around the fitted line.
+
+        Returns:
+            float: Residual standard deviation [Pa], None below three samples
+        """
+        n = len(self.__points)
+        denom = n * self.__sxx - self.__sx * self.__sx
+        if n < 3 or denom <= 0.0:
+            return None
+        sxy = self.__sxy - self.__sx * self.__sy / n
+        syy = self.__syy - self.__sy * self.__sy / n
+        sse = syy - sxy * sxy * n / denom
+        return math.sqrt(max(0.0, sse) / (n - 2))
+
+
+def rateStream(samples, estimator):
+    """Attach rate estimates to a sample stream.
+
+    Args:
+        samples (iterable): (timestamp, pressure, temperature) tuples
+        estimator (RateEstimator): Estimator fed with every sample
+
+    Yields:
+        tuple: (timestamp, pressure, temperature, rate [Pa/s],
+            vertical speed [m/s]), rate and speed are None until two samples
+    """
+    for sample in samples:
+        rate, speed = estimator.update(sample)
+        yield sample + (rate, speed)
@@ -0,0 +1,245 @@
+"""Recording raw results and replaying them through the driver.
+
+`RawRecorder` writes the raw pressure and temperature results of a sensor
+together with its coefficient registers and measurement configuration.
+`ReplaySensor` reads such a file and behaves like the recorded sensor: the
+coefficients are derived and the results compensated by the chip class
+itself, so `sampleStream()`, `RateEstimator`, `Deadband` and other consumers
+run the same code as with live data. Samples keep their recorded
+timestamps; playback runs as fast as possible or at a multiple of real time.
+
+File layout, little-endian:
+
+* `HEADER`: magic, version, chip (`CHIPS` index), PRS_CFG, TMP_CFG,
+  MEAS_CFG and CFG_REG, first coefficient register and count
+* the coefficient registers
+* `RECORD` per sample: timestamp [s], raw pressure, raw temperature
+"""
+
+import struct
+import time
+
+from .dps310 import DPS
+from .dps422 import DPS422
+from .stream import sampleStream
+from .types import Sample
+
+
+MAGIC = b'DPSRAW'
+VERSION = 1
+HEADER = struct.Struct('<6sBB4sBB')
+RECORD = struct.Struct('<dii')
+
+CHIPS = (DPS, DPS422)
+
+# Coefficient registers of each chip: first register, count
+COEFFICIENT_REGISTERS = {DPS: (0x10, 18), DPS422: (0x20, 26)}
+
+
+def _chipOf(sensor):
+    for cls in CHIPS:
+        if isinstance(sensor, cls):
+            return cls
+    raise TypeError('cannot record %s' % type(sensor).__name__)
+
+
+class RawRecorder:
+    """Write the raw results of a sensor to a file.
+    """
+
+    def __init__(self, sensor, f):
+        """Initial setting.
+
+        Writes the file header from the current configuration, so configure
+        the sensor first.
+
+        Args:
+            sensor (DPS or DPS422): Sensor
+            f (file): Binary file
+        """
+        self.sensor = sensor
+        self.f = f
+        cls = _chipOf(sensor)
+        start, length = COEFFICIENT_REGISTERS[cls]
+        config = bytes(val for _, val in sensor.MEASUREMENT_CONFIG)
+        f.write(HEADER.pack(MAGIC, VERSION, CHIPS.index(cls), config, start, length))
+        f.write(bytes(sensor._readRegisters(start, length)))
+
+    def record(self, fresh=False):
+        """Measure and record one sample.
+
+        Args:
+            fresh (bool): Wait for a new pressure result, see `measureSample()`
+
+        Returns:
+            Sample: The compensated sample, as `measureSample()` returns it
+        """
+        timestamp, raw_p, raw_t = self.sensor.measureRawSample(fresh)
+        self.f.write(RECORD.pack(timestamp, raw_p, raw_t))
+        temperature, pressure = self.sensor._compensate(raw_p, raw_t)
+        return Sample(timestamp, pressure, temperature)
+
+
+class _RegisterFile:
+    """SMBus stand-in serving recorded registers to a chip class.
+    """
+
+    def __init__(self, registers):
+        self.registers = registers
+
+    def read_byte_data(self, addr, reg):
+        if reg == 0x08:
+            # COEF_RDY, SENSOR_RDY, TMP_RDY and PRS_RDY always set
+            return 0xF0 | self.registers.get(reg, 0)
+        return self.registers.get(reg, 0)
+
+    def write_byte_data(self, addr, reg, val):
+        self.registers[reg] = val
+
+    def read_i2c_block_data(self, addr, reg, length):
+        return [self.read_byte_data(addr, reg + i) for i in range(length)]
+
+    def write_i2c_block_data(self, addr, reg, data):
+        for i, val in enumerate(data):
+            self.registers[reg + i] = val
+
+
+class ReplaySensor:
+    """Sensor playing back a file written by `RawRecorder`.
+
+    `measureSample()` returns the next recorded sample and raises `EOFError`
+    at the end of the file; `replayStream()` turns that into the end of a
+    stream.
+    """
+
+    def __init__(self, f, speed=None, chunk=4096):
+        """Initial setting.
+
+        Args:
+            f (file): Binary file written by `RawRecorder`
+            speed (float): Playback speed relative to the recording, e.g.
+                1.0 for real time, None for as fast as possible
+            chunk (int): Records read from the file at once
+
+        Raises:
+            ValueError: Not a raw recording
+        """
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError('truncated recording header')
+        magic, version, chip, config, start, length = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError('not a raw DPS recording')
+        registers = dict(zip(range(start, start + length), f.read(length)))
+        prs_cfg, _, meas_cfg, cfg_reg = config
+        self.chip = CHIPS[chip](_RegisterFile(registers), check_interval=None)
+        self.chip.configure(1 << ((prs_cfg >> 4) & 0x07), 1 << (prs_cfg & 0x0F),
+                            fifo=bool(cfg_reg & 0x02), background=meas_cfg != 0)
+        self.f = f
+        self.speed = speed
+        self.chunk = chunk
+        self.__records = self.__readRecords()
+        self.__start = None
+        self.__origin = None
+
+    def __readRecords(self):
+        while True:
+            data = self.f.read(RECORD.size * self.chunk)
+            data = data[:len(data) - len(data) % RECORD.size]
+            if not data:
+                return
+            yield from RECORD.iter_unpack(data)
+
+    def measureRawSample(self, fresh=False):
+        """Get the next recorded raw sample.
+
+        Args:
+            fresh (bool): Ignored, kept for the sensor interface
+
+        Returns:
+            float: Recorded timestamp [s]
+            int: Raw pressure
+            int: Raw temperature
+
+        Raises:
+            EOFError: End of the recording
+        """
+        try:
+            timestamp, raw_p, raw_t = next(self.__records)
+        except StopIteration:
+            raise EOFError('end of recording') from None
+        if self.speed is not None:
+            if self.__start is None:
+                self.__start = time.monotonic()
+                self.__origin = timestamp
+            delay = (timestamp - self.__origin) / self.speed - (time.monotonic() - self.__start)
+            if delay > 0:
+                time.sleep(delay)
+        return timestamp, raw_p, raw_t
+
+    def measureSample(self, fresh=False):
+        """Get the next recorded sample, compensated by the chip class.
+
+        Args:
+            fresh (bool): Ignored, kept for the sensor interface
+
+        Returns:
+            Sample: (recorded timestamp [s], pressure [Pa], temperature [C])
+
+        Raises:
+            EOFError: End of the recording
+        """
+        timestamp, raw_p, raw_t = self.measureRawSample(fresh)
+        temperature, pressure = self.chip._compensate(raw_p, raw_t)
+        return Sample(timestamp, pressure, temperature)
+
+    def getCoefficients(self):
+        """Get the calibration coefficients derived from the recording.
+
+        Returns:
+            tuple: Chip specific coefficients, see `DPS.types`
+        """
+        return self.chip.getCoefficients()
+
+    def getSamplePeriod(self):
+        """Get the recorded pressure measurement period.
+
+        Returns:
+            float: Time between two background mode measurements [s]
+        """
+        return self.chip.getSamplePeriod()
+
+    def getConversionTime(self):
+        """Get the recorded conversion time of one pressure measurement.
+
+        Returns:
+            float: Conversion time [s]
+        """
+        return self.chip.getConversionTime()
+
+    def getStats(self):
+        """Get bus and recovery counters, always zero during playback.
+
+        Returns:
+            dict: Counts of bus errors, retries, failed transactions and
+                reinitializations
+        """
+        return self.chip.getStats()
+
+
+def replayStream(sensor, count=None, stop=None, stats=None):
+    """Play a recording back through `sampleStream()`.
+
+    Args:
+        sensor (ReplaySensor): Recording
+        count (int): Number of samples, None for the whole recording
+        stop (threading.Event): Ends the stream when set
+        stats (TimingStats): Updated with every sample
+
+    Yields:
+        Sample: (recorded timestamp, pressure, temperature)
+    """
+    try:
+        yield from sampleStream(sensor, None, count, stop, stats=stats)
+    except EOFError:
+        return
@@ -0,0 +1,222 @@
+"""Multi-resolution rollup store for long-term history.
+
+`RollupStore` ingests samples and keeps count, mean, min, max and last of
+pressure and temperature per time bucket in several tiers, e.g. 1 s, 1 min
+and 1 h. Every tier is one file of fixed size, preallocated on creation and
+used as a ring of `slots` buckets, so retention is `slots * resolution` and
+the files never grow. A finished bucket costs one small write per tier; a
+range query reads one tier with at most two sequential reads.
+
+Slots are located by time (bucket number modulo `slots`) and carry their
+start time, so slots overwritten by a newer lap or never written are
+recognized and skipped.
+
+    with RollupStore('/var/lib/dps') as store:
+        for sample in sampleStream(sensor, 1.0):
+            store.add(sample)
+    hourly = store.query(time.time() - 30 * 86400, time.time(), 3600)
+"""
+
+import os
+import struct
+import time
+from collections import namedtuple
+
+
+# (resolution [s], slots): 1 s for a day, 1 min for 30 days, 1 h for a year
+TIERS = ((1.0, 86400), (60.0, 43200), (3600.0, 8760))
+
+MAGIC = b'DPSROLL1'
+HEADER = struct.Struct('<8sdI')
+SLOT = struct.Struct('<dq8d')
+
+Rollup = namedtuple('Rollup', ('start', 'count', 'pressure_mean', 'pressure_min', 'pressure_max',
+                               'pressure_last', 'temperature_mean', 'temperature_min',
+                               'temperature_max', 'temperature_last'))
+Rollup.__doc__ = """Aggregate of one bucket: start time [s], sample count, and mean, min,
+max and last of pressure [Pa] and temperature [C]."""
+
+
+class _Tier:
+    """One resolution: a ring of slots in a preallocated file.
+    """
+
+    def __init__(self, path, resolution, slots):
+        self.resolution = resolution
+        self.slots = slots
+        if os.path.exists(path):
+            self.f = open(path, 'r+b')
+            magic, file_resolution, file_slots = HEADER.unpack(self.f.read(HEADER.size))
+            if magic != MAGIC or file_resolution != resolution or file_slots != slots:
+                self.f.close()
+                raise ValueError('%s holds a different tier' % path)
+        else:
+            self.f = open(path, 'w+b')
+            self.f.write(HEADER.pack(MAGIC, resolution, slots))
+            chunk = bytes(SLOT.size * 1024)
+            for start in range(0, slots, 1024):
+                self.f.write(chunk[:SLOT.size * min(1024, slots - start)])
+            self.f.flush()
+            os.fsync(self.f.fileno())
+        self.bucket = None
+        self.resumed = False
+
+    def __offset(self, number):
+        return HEADER.size + (number % self.slots) * SLOT.size
+
+    def __readSlot(self, number):
+        self.f.seek(self.__offset(number))
+        return Rollup(*SLOT.unpack(self.f.read(SLOT.size)))
+
+    def add(self, timestamp, pressure, temperature):
+        number = int(timestamp // self.resolution)
+        bucket = self.bucket
+        if bucket is None or bucket[0] != number:
+            if bucket is not None:
+                self.write()
+            bucket = self.bucket = [number, 0, 0.0, pressure, pressure, pressure,
+                                    0.0, temperature, temperature, temperature]
+            if not self.resumed:
+                # Continue a bucket written before a restart
+                self.resumed = True
+                slot = self.__readSlot(number)
+                if slot.count and slot.start == number * self.resolution:
+                    bucket[1:] = [slot.count, slot.pressure_mean * slot.count, slot.pressure_min,
+                                  slot.pressure_max, slot.pressure_last,
+                                  slot.temperature_mean * slot.count, slot.temperature_min,
+                                  slot.temperature_max, slot.temperature_last]
+        bucket[1] += 1
+        bucket[2] += pressure
+        if pressure < bucket[3]:
+            bucket[3] = pressure
+        if pressure > bucket[4]:
+            bucket[4] = pressure
+        bucket[5] = pressure
+        bucket[6] += temperature
+        if temperature < bucket[7]:
+            bucket[7] = temperature
+        if temperature > bucket[8]:
+            bucket[8] = temperature
+        bucket[9] = temperature
+
+    def current(self):
+        number, count, p_sum, p_min, p_max, p_last, t_sum, t_min, t_max, t_last = self.bucket
+        return Rollup(number * self.resolution, count, p_sum / count, p_min, p_max, p_last,
+                      t_sum / count, t_min, t_max, t_last)
+
+    def write(self):
+        if self.bucket is None:
+            return
+        self.f.seek(self.__offset(self.bucket[0]))
+        self.f.write(SLOT.pack(*self.current()))
+
+    def read(self, first, last):
+        """Read buckets `first` to `last` (bucket numbers) in slot order."""
+        first = max(first, last - self.slots + 1)
+        rollups = []
+        number = first
+        while number <= last:
+            index = number % self.slots
+            n = min(last - number + 1, self.slots - index)
+            self.f.seek(self.__offset(number))
+            for i, values in enumerate(SLOT.iter_unpack(self.f.read(n * SLOT.size))):
+                if values[1] and values[0] == (number + i) * self.resolution:
+                    rollups.append(Rollup(*values))
+            number += n
+        return rollups
+
+
+class RollupStore:
+    """Downsampled sample history in fixed-size tier files.
+    """
+
+    def __init__(self, directory, tiers=TIERS, offset=None):
+        """Initial setting.
+
+        Opens the tier files, creating and preallocating missing ones.
+
+        Args:
+            directory (str): Directory of the tier files
+            tiers (tuple): (resolution [s], slots) pairs
+            offset (float): Added to sample timestamps to make them
+                absolute; None for the offset of time.monotonic to
+                time.time, so history survives restarts
+
+        Raises:
+            ValueError: A tier file exists with a different layout
+        """
+        if offset is None:
+            offset = time.time() - time.monotonic()
+        self.offset = offset
+        self.latest = None
+        os.makedirs(directory, exist_ok=True)
+        self.tiers = []
+        for resolution, slots in sorted(tiers):
+            path = os.path.join(directory, 'rollup_%gs.bin' % resolution)
+            self.tiers.append(_Tier(path, resolution, slots))
+
+    def add(self, sample):
+        """Ingest one sample.
+
+        Args:
+            sample (tuple): (timestamp, pressure, temperature)
+        """
+        timestamp, pressure, temperature = sample
+        timestamp += self.offset
+        self.latest = timestamp
+        for tier in self.tiers:
+            tier.add(timestamp, pressure, temperature)
+
+    def query(self, start, end, resolution=None):
+        """Get the buckets of a time range from one tier.
+
+        The tier used is the coarsest one not coarser than `resolution`;
+        if its retention does not reach back to `start`, the finest tier
+        that does.
+
+        Args:
+            start (float): Range start, absolute time [s]
+            end (float): Range end, absolute time [s]
+            resolution (float): Wanted bucket size [s], None for the finest
+
+        Returns:
+            list: `Rollup` buckets, oldest first; empty buckets are left out
+        """
+        tier = self.tiers[0]
+        if resolution is not None:
+            tier = ([t for t in self.tiers if t.resolution <= resolution] or self.tiers[:1])[-1]
+        age = (end if self.latest is None else max(end, self.latest)) - start
+        if age > tier.resolution * tier.slots:
+            deeper = [t for t in self.tiers if t.resolution * t.slots >= age]
+            if deeper:
+                tier = deeper[0]
+        first = int(start // tier.resolution)
+        last = int(end // tier.resolution)
+        rollups = tier.read(first, last)
+        if tier.bucket is not None and first <= tier.bucket[0] <= last:
+            current = tier.current()
+            if rollups and rollups[-1].start == current.start:
+                rollups[-1] = current
+            else:
+                rollups.append(current)
+        return rollups
+
+    def flush(self):
+        """Write the open buckets and flush the files.
+        """
+        for tier in self.tiers:
+            tier.write()
+            tier.f.flush()
+
+    def close(self):
+        """Write the open buckets and close the files.
+        """
+        self.flush()
+        for tier in self.tiers:
+            tier.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
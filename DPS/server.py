@@ -0,0 +1,348 @@
+"""Local socket server for DPS sensor data.
+
+Exposes one or more `DPS` / `DPS422` sensors over a Unix domain socket or a
+localhost TCP port; other TCP addresses are rejected. Samples are taken by
+a background sampler and kept in an in-memory cache, so client requests
+never trigger bus reads.
+
+Protocol
+--------
+Every request is a fixed 4-byte header `REQUEST` = (command, sensor, count):
+
+* ``b'L'`` fetch last N: the server answers with a little-endian uint32
+  sample count followed by that many `SAMPLE` records (oldest first).
+  `count` is N, 0 means the whole cache.
+* ``b'S'`` subscribe: the server first sends the last `count` cached
+  samples (none if 0), then every new sample as it arrives, until the
+  client closes the connection.
+
+A `SAMPLE` record is (timestamp [s, time.monotonic], pressure [Pa],
+temperature [C]) packed as three little-endian doubles (24 bytes).
+"""
+
+import ipaddress
+import os
+import socket
+import socketserver
+import struct
+import threading
+from collections import deque
+
+from .stream import sampleStream
+
+
+REQUEST = struct.Struct('<cBH')
+SAMPLE = struct.Struct('<ddd')
+COUNT = struct.Struct('<I')
+
+CMD_LAST = b'L'
+CMD_SUBSCRIBE = b'S'
+
+
+def packSamples(samples):
+    """Pack samples into one contiguous buffer.
+
+    Args:
+        samples (list): (timestamp, pressure, temperature) tuples
+
+    Returns:
+        bytearray: `len(samples) * SAMPLE.size` bytes
+    """
+    buf = bytearray(len(samples) * SAMPLE.size)
+    offset = 0
+    for sample in samples:
+        SAMPLE.pack_into(buf, offset, *sample)
+        offset += SAMPLE.size
+    return buf
+
+
+def unpackSamples(buf):
+    """Unpack a buffer of `SAMPLE` records.
+
+    Args:
+        buf (bytes): Packed samples
+
+    Returns:
+        list: (timestamp, pressure, temperature) tuples
+    """
+    return list(SAMPLE.iter_unpack(buf))
+
+
+class SampleCache:
+    """Bounded, thread-safe cache of the most recent samples of one sensor.
+    """
+
+    def __init__(self, size=1024):
+        """Initial setting.
+
+        Args:
+            size (int): Number of samples kept
+        """
+        self.__samples = deque(maxlen=size)
+        self.__seq = 0
+        self.__cond = threading.Condition()
+
+    def append(self, sample):
+        """Add a sample and wake up subscribers.
+
+        Args:
+            sample (tuple): (timestamp, pressure, temperature)
+        """
+        with self.__cond:
+            self.__samples.append(sample)
+            self.__seq += 1
+            self.__cond.notify_all()
+
+    def last(self, n=0):
+        """Get the last `n` samples.
+
+        Args:
+            n (int): Number of samples, 0 for all cached samples
+
+        Returns:
+            list: Samples, oldest first
+            int: Sequence number of the newest sample
+        """
+        with self.__cond:
+            samples = list(self.__samples)
+            seq = self.__seq
+        if n:
+            samples = samples[-n:]
+        return samples, seq
+
+    def since(self, seq, timeout=None):
+        """Wait for samples newer than `seq`.
+
+        Args:
+            seq (int): Sequence number returned by a previous call
+            timeout (float): Max wait time [s], None waits forever
+
+        Returns:
+            list: New samples, oldest first (empty on timeout)
+            int: Sequence number of the newest sample
+        """
+        with self.__cond:
+            self.__cond.wait_for(lambda: self.__seq != seq, timeout)
+            new = min(self.__seq - seq, len(self.__samples))
+            samples = list(self.__samples)[len(self.__samples) - new:]
+            return samples, self.__seq
+
+
+class Sampler(threading.Thread):
+    """Background thread reading one sensor into a `SampleCache`.
+
+    A read that fails after all bus retries is counted in `error_count` and
+    kept in `last_error`; sampling resumes after one interval.
+    """
+
+    def __init__(self, sensor, cache, interval=0.25):
+        """Initial setting.
+
+        Args:
+            sensor (DPS or DPS422): Sensor providing `measureSample()`
+            cache (SampleCache): Destination cache
+            interval (float): Sampling interval [s]
+        """
+        super().__init__(daemon=True)
+        self.sensor = sensor
+        self.cache = cache
+        self.interval = interval
+        self.error_count = 0
+        self.last_error = None
+        self.__stop = threading.Event()
+
+    def run(self):
+        while not self.__stop.is_set():
+            try:
+                for sample in sampleStream(self.sensor, self.interval, stop=self.__stop):
+                    self.cache.append(sample)
+            except OSError as e:
+                self.error_count += 1
+                self.last_error = e
+                self.__stop.wait(self.interval or 1.0)
+
+    def stop(self):
+        """Stop sampling after the current reading.
+        """
+        self.__stop.set()
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+
+    def handle(self):
+        caches = self.server.caches
+        while True:
+            header = self.__recvExact(REQUEST.size)
+            if header is None:
+                return
+            cmd, index, count = REQUEST.unpack(header)
+            if index >= len(caches):
+                return
+            samples, seq = caches[index].last(count)
+            if cmd == CMD_LAST:
+                self.request.sendall(COUNT.pack(len(samples)) + packSamples(samples))
+            elif cmd == CMD_SUBSCRIBE:
+                self.__stream(caches[index], samples if count else [], seq)
+                return
+            else:
+                return
+
+    def __stream(self, cache, samples, seq):
+        try:
+            while not self.server.closed:
+                if samples:
+                    self.request.sendall(packSamples(samples))
+                samples, seq = cache.since(seq, timeout=1.0)
+        except OSError:
+            pass
+
+    def __recvExact(self, size):
+        buf = b''
+        while len(buf) < size:
+            chunk = self.request.recv(size - len(buf))
+            if not chunk:
+                return None
+            buf += chunk
+        return buf
+
+
+def _isLoopback(host):
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class _TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class SensorServer:
+    """Serve cached sensor samples over a local socket.
+
+    Sensor `i` of `sensors` is addressed by index `i` in requests.
+    """
+
+    def __init__(self, sensors, address, interval=0.25, cache_size=1024):
+        """Initial setting.
+
+        Args:
+            sensors (list): `DPS` / `DPS422` instances
+            address (str or tuple): Unix socket path, or (host, port) for TCP
+                on a loopback address
+            interval (float): Sampling interval [s]
+            cache_size (int): Samples kept per sensor
+
+        Raises:
+            ValueError: TCP address not on the loopback interface
+        """
+        if not isinstance(address, str) and not _isLoopback(address[0]):
+            raise ValueError('%r is not a loopback address' % (address[0],))
+        self.caches = [SampleCache(cache_size) for _ in sensors]
+        self.samplers = [Sampler(s, c, interval) for s, c in zip(sensors, self.caches)]
+        if isinstance(address, str):
+            if os.path.exists(address):
+                os.unlink(address)
+            self.server = _UnixServer(address, _RequestHandler)
+        else:
+            self.server = _TCPServer(address, _RequestHandler)
+            self.server.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.server.caches = self.caches
+        self.server.closed = False
+        self.address = address
+        self.__serving = False
+
+    def start(self):
+        """Start sampling and serve requests in a background thread.
+        """
+        for sampler in self.samplers:
+            sampler.start()
+        self.__serving = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def serveForever(self):
+        """Start sampling and serve requests in the calling thread.
+        """
+        for sampler in self.samplers:
+            sampler.start()
+        self.__serving = True
+        self.server.serve_forever()
+
+    def close(self):
+        """Stop sampling and serving, and remove the Unix socket file.
+        """
+        for sampler in self.samplers:
+            sampler.stop()
+        self.server.closed = True
+        if self.__serving:
+            # shutdown() waits for serve_forever(), so only once it runs
+            self.server.shutdown()
+        self.server.server_close()
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+
+
+class SensorClient:
+    """Client for `SensorServer`.
+    """
+
+    def __init__(self, address):
+        """Connect to a server.
+
+        Args:
+            address (str or tuple): Unix socket path, or (host, port) for TCP
+        """
+        if isinstance(address, str):
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.sock.connect(address)
+
+    def last(self, n=0, sensor=0):
+        """Fetch the last `n` cached samples.
+
+        Args:
+            n (int): Number of samples, 0 for the whole cache
+            sensor (int): Sensor index
+
+        Returns:
+            list: (timestamp, pressure, temperature) tuples, oldest first
+        """
+        self.sock.sendall(REQUEST.pack(CMD_LAST, sensor, n))
+        count, = COUNT.unpack(self.__recvExact(COUNT.size))
+        return unpackSamples(self.__recvExact(count * SAMPLE.size))
+
+    def subscribe(self, sensor=0, backlog=0):
+        """Stream samples as they are taken.
+
+        Args:
+            sensor (int): Sensor index
+            backlog (int): Number of cached samples sent first
+
+        Yields:
+            tuple: (timestamp, pressure, temperature)
+        """
+        self.sock.sendall(REQUEST.pack(CMD_SUBSCRIBE, sensor, backlog))
+        while True:
+            yield SAMPLE.unpack(self.__recvExact(SAMPLE.size))
+
+    def close(self):
+        self.sock.close()
+
+    def __recvExact(self, size):
+        buf = bytearray(size)
+        view = memoryview(buf)
+        while view:
+            n = self.sock.recv_into(view)
+            if not n:
+                raise ConnectionError('server closed the connection')
+            view = view[n:]
+        return buf
@@ -0,0 +1,339 @@
+"""Sample streams for DPS sensors.
+
+A sample is a (timestamp [s, time.monotonic], pressure [Pa],
+temperature [C]) tuple, see `DPS.measureSample()`. `sampleStream` reads a
+sensor at a fixed interval or at the sensor's own rate, `fifoStream` drains
+the FIFO of a DPS310 / DPS368 at its native rate, `TimingStats`
+reports the jitter and drift of such a session, `Deadband` /
+`deadbandStream` reduce a stream to the samples worth publishing, and
+`SettlingDetector` / `settledStream` hold a stream back until the readings
+have stabilized after power-up.
+"""
+
+import math
+import time
+from collections import deque
+
+
+def sampleStream(sensor, interval=0.25, count=None, stop=None, deadband=None, stats=None):
+    """Read a sensor at a fixed interval or at its own measurement rate.
+
+    Args:
+        sensor (DPS or DPS422): Sensor providing `measureSample()`
+        interval (float): Sampling interval [s], None to wait for every new
+            pressure result of the sensor instead (see `DPS.measureSample()`)
+        count (int): Number of samples read, None for endless
+        stop (threading.Event): Ends the stream when set
+        deadband (Deadband): Only yield samples passing this policy
+        stats (TimingStats): Updated with the timestamp of every sample read
+
+    Yields:
+        tuple: (timestamp, pressure, temperature)
+    """
+    deadline = time.monotonic()
+    n = 0
+    while count is None or n < count:
+        sample = sensor.measureSample(fresh=interval is None)
+        n += 1
+        if stats is not None:
+            stats.add(sample[0])
+        if deadband is None or deadband.check(sample):
+            yield sample
+        if interval is None:
+            if stop is not None and stop.is_set():
+                return
+            continue
+        deadline += interval
+        delay = max(0.0, deadline - time.monotonic())
+        if stop is None:
+            time.sleep(delay)
+        elif stop.wait(delay):
+            return
+
+
+def fifoStream(sensor, count=None, stop=None, stats=None, poll=None):
+    """Read a sensor at its native rate through its result FIFO.
+
+    Args:
+        sensor (DPS): Sensor configured with `configure(..., fifo=True)`
+        count (int): Number of samples read, None for endless
+        stop (threading.Event): Ends the stream when set
+        stats (TimingStats): Updated with every sample and FIFO overflow
+        poll (float): Time between two FIFO reads [s], None for a quarter
+            of the FIFO capacity
+
+    Yields:
+        Sample: (timestamp, pressure, temperature)
+    """
+    if poll is None:
+        poll = sensor.getSamplePeriod() * sensor.FIFO_SIZE / 8
+    n = 0
+    while count is None or n < count:
+        samples, full = sensor.readFifo()
+        if full and stats is not None:
+            stats.overflows += 1
+        for sample in samples:
+            if count is not None and n >= count:
+                return
+            n += 1
+            if stats is not None:
+                stats.add(sample[0])
+            yield sample
+        if stop is None:
+            time.sleep(poll)
+        elif stop.wait(poll):
+            return
+
+
+class TimingStats:
+    """Jitter and drift statistics of an acquisition session.
+
+    Jitter is the standard deviation of the sample intervals; drift is the
+    offset of the latest sample from the nominal schedule started at the
+    first sample.
+    """
+
+    def __init__(self, nominal=None):
+        """Initial setting.
+
+        Args:
+            nominal (float): Nominal sample interval [s], None to use the
+                mean observed interval (drift is then always 0)
+        """
+        self.nominal = nominal
+        self.count = 0
+        self.first = None
+        self.last = None
+        self.mean_interval = 0.0
+        self.max_deviation = 0.0
+        self.overflows = 0
+        self.__m2 = 0.0
+
+    def add(self, timestamp):
+        """Record the timestamp of the next sample.
+
+        Args:
+            timestamp (float): Sample timestamp [s]
+        """
+        if self.first is None:
+            self.first = timestamp
+        else:
+            interval = timestamp - self.last
+            n = self.count
+            delta = interval - self.mean_interval
+            self.mean_interval += delta / n
+            self.__m2 += delta * (interval - self.mean_interval)
+            nominal = self.mean_interval if self.nominal is None else self.nominal
+            self.max_deviation = max(self.max_deviation, abs(interval - nominal))
+        self.last = timestamp
+        self.count += 1
+
+    @property
+    def jitter(self):
+        """float: Standard deviation of the sample intervals [s]"""
+        if self.count < 3:
+            return 0.0
+        return math.sqrt(self.__m2 / (self.count - 2))
+
+    @property
+    def drift(self):
+        """float: Offset of the last sample from the nominal schedule [s]"""
+        if self.count < 2 or self.nominal is None:
+            return 0.0
+        return (self.last - self.first) - (self.count - 1) * self.nominal
+
+    @property
+    def drift_ppm(self):
+        """float: Drift relative to the session length [ppm]"""
+        if self.count < 2 or self.last == self.first:
+            return 0.0
+        return self.drift / (self.last - self.first) * 1e6
+
+    def report(self):
+        """Get all statistics.
+
+        Returns:
+            dict: samples, mean_interval, jitter, max_deviation, drift,
+                drift_ppm and overflows
+        """
+        return {
+            'samples': self.count,
+            'mean_interval': self.mean_interval,
+            'jitter': self.jitter,
+            'max_deviation': self.max_deviation,
+            'drift': self.drift,
+            'drift_ppm': self.drift_ppm,
+            'overflows': self.overflows,
+        }
+
+
+class Deadband:
+    """Send-on-delta publishing policy.
+
+    A sample is emitted when pressure or temperature moved beyond its
+    deadband relative to the last emitted sample, but not before
+    `min_interval` has passed since that emission. A change suppressed by
+    `min_interval` is not lost: the first sample after the interval is
+    emitted. `heartbeat` forces an emission when nothing was sent for that
+    long.
+
+    The deadband of a quantity is max(absolute, relative * |last value|);
+    leave both at None to ignore that quantity.
+    """
+
+    def __init__(self, pressure_abs=None, pressure_rel=None,
+                 temperature_abs=None, temperature_rel=None,
+                 min_interval=0.0, heartbeat=None):
+        """Initial setting.
+
+        Args:
+            pressure_abs (float): Absolute pressure deadband [Pa]
+            pressure_rel (float): Relative pressure deadband (0.001 = 0.1 %)
+            temperature_abs (float): Absolute temperature deadband [C]
+            temperature_rel (float): Relative temperature deadband
+            min_interval (float): Minimum time between emissions [s]
+            heartbeat (float): Maximum time between emissions [s],
+                None to disable
+        """
+        self.pressure_abs = pressure_abs
+        self.pressure_rel = pressure_rel
+        self.temperature_abs = temperature_abs
+        self.temperature_rel = temperature_rel
+        self.min_interval = min_interval
+        self.heartbeat = heartbeat
+        self.reset()
+
+    def reset(self):
+        """Forget the last emitted sample, so the next one is emitted.
+        """
+        self.last = None
+        self.__pending = False
+
+    @staticmethod
+    def __moved(value, last, absolute, relative):
+        if absolute is None and relative is None:
+            return False
+        band = max(absolute or 0.0, (relative or 0.0) * abs(last))
+        return abs(value - last) > band
+
+    def check(self, sample):
+        """Decide whether to emit a sample.
+
+        Args:
+            sample (tuple): (timestamp, pressure, temperature)
+
+        Returns:
+            bool: True if the sample should be emitted
+        """
+        if self.last is None:
+            self.last = sample
+            return True
+        timestamp, pressure, temperature = sample
+        last_ts, last_p, last_t = self.last
+        elapsed = timestamp - last_ts
+        if (self.__moved(pressure, last_p, self.pressure_abs, self.pressure_rel)
+                or self.__moved(temperature, last_t, self.temperature_abs, self.temperature_rel)):
+            self.__pending = True
+        emit = ((self.__pending and elapsed >= self.min_interval)
+                or (self.heartbeat is not None and elapsed >= self.heartbeat))
+        if emit:
+            self.last = sample
+            self.__pending = False
+        return emit
+
+
+def deadbandStream(samples, deadband):
+    """Filter a sample stream through a `Deadband` policy.
+
+    Args:
+        samples (iterable): (timestamp, pressure, temperature) tuples
+        deadband (Deadband): Publishing policy
+
+    Yields:
+        tuple: Samples to publish
+    """
+    for sample in samples:
+        if deadband.check(sample):
+            yield sample
+
+
+class SettlingDetector:
+    """Detect when readings have stabilized, e.g. after power-up.
+
+    The readings count as settled once the pressures and the temperatures
+    of the last `window` samples each span no more than their tolerance.
+    Choose the pressure tolerance above the noise of the oversampling rate
+    in use (see `DPS.power.PRESSURE_NOISE`).
+    """
+
+    def __init__(self, window=8, pressure_tolerance=2.0, temperature_tolerance=0.05):
+        """Initial setting.
+
+        Args:
+            window (int): Number of consecutive samples judged together
+            pressure_tolerance (float): Max pressure span in the window [Pa]
+            temperature_tolerance (float): Max temperature span in the window [C]
+        """
+        self.window = window
+        self.pressure_tolerance = pressure_tolerance
+        self.temperature_tolerance = temperature_tolerance
+        self.reset()
+
+    def reset(self):
+        """Start over, e.g. after a reconfiguration.
+        """
+        self.__samples = deque(maxlen=self.window)
+        self.first = None
+        self.settled_at = None
+
+    @property
+    def settled(self):
+        """bool: True once the readings have settled"""
+        return self.settled_at is not None
+
+    @property
+    def settling_time(self):
+        """float: Time from the first sample to settling [s], None before"""
+        if self.settled_at is None:
+            return None
+        return self.settled_at - self.first
+
+    def update(self, sample):
+        """Add a sample.
+
+        Args:
+            sample (tuple): (timestamp, pressure, temperature)
+
+        Returns:
+            bool: True if the readings have settled
+        """
+        if self.settled_at is not None:
+            return True
+        if self.first is None:
+            self.first = sample[0]
+        samples = self.__samples
+        samples.append(sample)
+        if len(samples) < self.window:
+            return False
+        pressures = [p for _, p, _ in samples]
+        temperatures = [t for _, _, t in samples]
+        if (max(pressures) - min(pressures) <= self.pressure_tolerance
+                and max(temperatures) - min(temperatures) <= self.temperature_tolerance):
+            self.settled_at = sample[0]
+            return True
+        return False
+
+
+def settledStream(samples, detector):
+    """Drop samples until the readings have settled.
+
+    Args:
+        samples (iterable): (timestamp, pressure, temperature) tuples
+        detector (SettlingDetector): Settling criterion
+
+    Yields:
+        tuple: Samples from the one that completed settling on
+    """
+    for sample in samples:
+        if detector.update(sample):
+            yield sample
@@ -0,0 +1,111 @@
+"""Simultaneous command mode measurements on several sensors.
+
+Reading sensors one after another puts the time of a full measurement
+between their results, which shows up as error in differential pressure.
+`SyncGroup` starts the temperature conversions of all sensors back to back,
+waits once for the longest conversion, does the same for pressure, and then
+reads every result in one burst. The samples come back as one
+`SampleBatch` in sensor order together with the spread of the pressure
+conversion start times, typically a fraction of a millisecond per sensor.
+
+    group = SyncGroup([DPS(1, 0x77), DPS(1, 0x76)], oversampling=16)
+    batch, spread = group.measure()
+    difference = batch.pressures[0] - batch.pressures[1]
+"""
+
+from collections import namedtuple
+from contextlib import ExitStack
+from time import monotonic, sleep
+
+from .types import SampleBatch
+
+
+AlignedReading = namedtuple('AlignedReading', ('batch', 'spread'))
+AlignedReading.__doc__ = """Result of `SyncGroup.measure()`.
+
+batch: SampleBatch with one sample per sensor, in sensor order
+spread: time between the first and the last pressure conversion start [s]
+"""
+
+
+class SyncGroup:
+    """Sensors triggered together in command mode.
+    """
+
+    def __init__(self, sensors, oversampling=None):
+        """Initial setting.
+
+        Args:
+            sensors (list): DPS or DPS422 sensors, on one or several buses
+            oversampling (int): Put every sensor into command mode at this
+                oversampling rate, None if they are configured already
+                (`configure(..., background=False)`)
+        """
+        self.sensors = list(sensors)
+        if oversampling is not None:
+            for sensor in self.sensors:
+                sensor.configure(1, oversampling, background=False)
+
+    def __convert(self, temperature):
+        starts = [sensor.startConversion(temperature) for sensor in self.sensors]
+        longest = max(sensor.getConversionTime() for sensor in self.sensors)
+        sleep(max(0.0, longest - 0.001))
+        deadline = monotonic() + longest + 0.01
+        pending = list(self.sensors)
+        while pending:
+            pending = [sensor for sensor in pending if not sensor.isReady(temperature)]
+            if not pending:
+                break
+            if monotonic() > deadline:
+                raise TimeoutError('no result within %.3f s' % (2 * longest + 0.01))
+            sleep(0.001)
+        return starts
+
+    def measure(self):
+        """Measure all sensors simultaneously.
+
+        Every sensor is locked for the whole measurement.
+
+        Returns:
+            AlignedReading: (batch, spread), each sample timestamped at the
+                middle of its pressure conversion
+        """
+        with ExitStack() as stack:
+            for sensor in sorted(self.sensors, key=id):
+                stack.enter_context(sensor.lock)
+            # Before the start loop, so they never delay one sensor's start
+            for sensor in self.sensors:
+                sensor._checkResetIfDue()
+            self.__convert(True)
+            starts = self.__convert(False)
+            batch = SampleBatch()
+            for sensor, start in zip(self.sensors, starts):
+                temperature, pressure = sensor._compensate(*sensor._readRawResults())
+                batch.append((start + sensor.getConversionTime() / 2, pressure, temperature))
+        return AlignedReading(batch, max(starts) - min(starts))
+
+    def stream(self, interval=None, count=None, stop=None):
+        """Measure all sensors repeatedly.
+
+        Args:
+            interval (float): Time between measurements [s], None for back
+                to back
+            count (int): Number of measurements, None for endless
+            stop (threading.Event): Ends the stream when set
+
+        Yields:
+            AlignedReading: (batch, spread)
+        """
+        deadline = monotonic()
+        n = 0
+        while count is None or n < count:
+            yield self.measure()
+            n += 1
+            delay = 0.0
+            if interval is not None:
+                deadline += interval
+                delay = max(0.0, deadline - monotonic())
+            if stop is None:
+                sleep(delay)
+            elif stop.wait(delay):
+                return
@@ -0,0 +1,191 @@
+"""Bus access for the DPS drivers.
+
+`ResilientBus` wraps an SMBus with retries; `applyRegisterProgram` writes
+configuration sequences with as few transactions as possible. `smbus` is
+only imported when a bus is opened by number.
+
+Every bus has one reentrant lock, shared by all `ResilientBus` objects on
+it (see `busLock()`). Each transaction holds it, and multi-register
+sequences hold it for the whole sequence, so they are never interleaved
+with another thread's access to the same bus. Different buses never wait
+for each other.
+"""
+
+import threading
+import weakref
+from contextlib import nullcontext
+from time import monotonic, sleep
+
+
+# Longest SMBus block transfer [bytes]
+BLOCK_MAX = 32
+
+# Writable bits of registers holding status flags; other registers are
+# compared in full when skipping unchanged writes or verifying.
+CONFIG_MASKS = {0x06: 0x7F, 0x08: 0x07}
+
+
+# Locks of buses opened by number, and of bus objects; the latter are
+# dropped with their bus
+_bus_locks = {}
+_object_locks = weakref.WeakKeyDictionary()
+_bus_locks_guard = threading.Lock()
+
+
+def busLock(bus):
+    """Get the lock of an I2C bus.
+
+    Args:
+        bus (int or SMBus): I2C bus number or SMBus-compatible object
+
+    Returns:
+        threading.RLock: The same lock for every call with the same bus
+    """
+    with _bus_locks_guard:
+        locks = _bus_locks
+        if not isinstance(bus, int):
+            try:
+                weakref.ref(bus)
+                locks = _object_locks
+            except TypeError:
+                # Not weakly referenceable, kept for the life of the process
+                pass
+        lock = locks.get(bus)
+        if lock is None:
+            lock = locks[bus] = threading.RLock()
+        return lock
+
+
+class ConfigVerifyError(OSError):
+    """Raised when a configuration readback does not match the written values.
+    """
+
+
+class ResilientBus:
+    """SMBus wrapper retrying failed transactions.
+
+    Every transaction that raises `OSError` is retried up to `retries` times
+    with exponential backoff, but never for longer than `timeout` seconds.
+    `faulted` is set on any error, so the sensor can check itself for a
+    reset once the bus responds again. `lock` is the lock of the bus,
+    held during every transaction including its retries.
+    """
+
+    def __init__(self, bus=1, retries=3, timeout=0.1, backoff=0.001):
+        """Initial setting.
+
+        Args:
+            bus (int or SMBus): I2C bus number or SMBus-compatible object
+            retries (int): Max retries per transaction
+            timeout (float): Max time spent retrying one transaction [s]
+            backoff (float): Delay before the first retry [s], doubled on
+                every further retry
+        """
+        self.lock = busLock(bus)
+        if isinstance(bus, int):
+            import smbus
+            bus = smbus.SMBus(bus)
+        self.bus = bus
+        self.retries = retries
+        self.timeout = timeout
+        self.backoff = backoff
+        self.faulted = False
+        self.error_count = 0
+        self.retry_count = 0
+        self.failure_count = 0
+
+    def __call(self, func, *args):
+        with self.lock:
+            deadline = monotonic() + self.timeout
+            delay = self.backoff
+            attempt = 0
+            while True:
+                try:
+                    return func(*args)
+                except OSError:
+                    self.error_count += 1
+                    self.faulted = True
+                    if attempt >= self.retries or monotonic() + delay > deadline:
+                        self.failure_count += 1
+                        raise
+                attempt += 1
+                self.retry_count += 1
+                sleep(delay)
+                delay *= 2
+
+    def read_byte_data(self, addr, reg):
+        return self.__call(self.bus.read_byte_data, addr, reg)
+
+    def write_byte_data(self, addr, reg, val):
+        return self.__call(self.bus.write_byte_data, addr, reg, val)
+
+    def read_i2c_block_data(self, addr, reg, length):
+        return self.__call(self.bus.read_i2c_block_data, addr, reg, length)
+
+    def write_i2c_block_data(self, addr, reg, data):
+        return self.__call(self.bus.write_i2c_block_data, addr, reg, data)
+
+
+def applyRegisterProgram(bus, addr, program, skip_unchanged=False, verify=False):
+    """Write a register program with the minimum number of bus transactions.
+
+    A register program is a sequence of (register, value) pairs applied in
+    order. Consecutive registers are merged into block writes of up to
+    `BLOCK_MAX` bytes. If the bus has a `lock`, it is held for the whole
+    program.
+
+    Skipping and verifying compare against one burst readback, so they need
+    a program that writes every register once and spans at most
+    `BLOCK_MAX` registers. Programs whose order matters, like unlock
+    sequences, are written in full without them.
+
+    Args:
+        bus (SMBus): Bus, e.g. a `ResilientBus`
+        addr (int): I2C address of the sensor
+        program (tuple): (register, value) pairs
+        skip_unchanged (bool): Read the registers back in one burst first and
+            drop writes whose value already matches the device
+        verify (bool): Read the registers back in one burst afterwards and
+            raise `ConfigVerifyError` on a mismatch
+
+    Returns:
+        int: Number of registers written
+
+    Raises:
+        ValueError: `skip_unchanged` or `verify` with a program writing a
+            register twice or spanning more than `BLOCK_MAX` registers
+    """
+    program = writes = list(program)
+    if skip_unchanged or verify:
+        registers = [reg for reg, _ in program]
+        if len(set(registers)) != len(registers):
+            raise ValueError('cannot skip or verify a program writing a register twice')
+        start = min(registers)
+        length = max(registers) - start + 1
+        if length > BLOCK_MAX:
+            raise ValueError('cannot read back %d registers in one block, at most %d'
+                             % (length, BLOCK_MAX))
+    with getattr(bus, 'lock', None) or nullcontext():
+        if skip_unchanged:
+            current = bus.read_i2c_block_data(addr, start, length)
+            writes = [(reg, val) for reg, val in writes
+                      if (current[reg - start] ^ val) & CONFIG_MASKS.get(reg, 0xFF)]
+        i = 0
+        while i < len(writes):
+            j = i + 1
+            while (j < len(writes) and j - i < BLOCK_MAX
+                   and writes[j][0] == writes[j - 1][0] + 1):
+                j += 1
+            if j - i == 1:
+                bus.write_byte_data(addr, writes[i][0], writes[i][1])
+            else:
+                bus.write_i2c_block_data(addr, writes[i][0], [val for _, val in writes[i:j]])
+            i = j
+        if verify:
+            current = bus.read_i2c_block_data(addr, start, length)
+            for reg, val in program:
+                mask = CONFIG_MASKS.get(reg, 0xFF)
+                if (current[reg - start] ^ val) & mask:
+                    raise ConfigVerifyError('register 0x%02X reads 0x%02X, expected 0x%02X'
+                                            % (reg, current[reg - start] & mask, val & mask))
+        return len(writes)
@@ -0,0 +1,121 @@
+"""Compact data types for samples and calibration coefficients.
+
+`Sample` and the coefficient types are named tuples: fixed layout, no
+per-instance `__dict__`, and still unpackable like the plain tuples the
+driver used to return. `SampleBatch` keeps its columns in `array('d')`
+buffers that NumPy (`numpy.frombuffer`) or a file can take without copying.
+"""
+
+from array import array
+from collections import namedtuple
+
+
+Sample = namedtuple('Sample', ('timestamp', 'pressure', 'temperature'))
+Sample.__doc__ = """Timestamped measurement: time.monotonic [s], pressure [Pa], temperature [C]."""
+
+Coefficients = namedtuple('Coefficients', ('c0', 'c1', 'c00', 'c10', 'c20', 'c30', 'c01', 'c11', 'c21'))
+Coefficients.__doc__ = """Calibration coefficients of the DPS310 / DPS368."""
+
+Coefficients422 = namedtuple('Coefficients422', ('a_prime', 'b_prime', 'c00', 'c01', 'c02', 'c10',
+                                                 'c11', 'c12', 'c20', 'c21', 'c30'))
+Coefficients422.__doc__ = """Calibration coefficients of the DPS422 (a_prime and b_prime derived)."""
+
+
+class SampleBatch:
+    """Column-oriented batch of samples.
+
+    `timestamps`, `pressures` and `temperatures` are `array('d')` columns of
+    equal length.
+    """
+
+    __slots__ = ('timestamps', 'pressures', 'temperatures')
+
+    def __init__(self, samples=()):
+        """Initial setting.
+
+        Args:
+            samples (iterable): Initial (timestamp, pressure, temperature) samples
+        """
+        self.timestamps = array('d')
+        self.pressures = array('d')
+        self.temperatures = array('d')
+        self.extend(samples)
+
+    def append(self, sample):
+        """Add one sample.
+
+        Args:
+            sample (tuple): (timestamp, pressure, temperature)
+        """
+        timestamp, pressure, temperature = sample
+        self.timestamps.append(timestamp)
+        self.pressures.append(pressure)
+        self.temperatures.append(temperature)
+
+    def extend(self, samples):
+        """Add several samples.
+
+        Args:
+            samples (iterable): (timestamp, pressure, temperature) samples
+        """
+        for sample in samples:
+            self.append(sample)
+
+    def clear(self):
+        """Remove all samples, keeping the column objects.
+        """
+        del self.timestamps[:]
+        del self.pressures[:]
+        del self.temperatures[:]
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            batch = SampleBatch()
+            batch.timestamps = self.timestamps[index]
+            batch.pressures = self.pressures[index]
+            batch.temperatures = self.temperatures[index]
+            return batch
+        return Sample(self.timestamps[index], self.pressures[index], self.temperatures[index])
+
+    def __iter__(self):
+        return map(Sample, self.timestamps, self.pressures, self.temperatures)
+
+    def columns(self):
+        """Get zero-copy views of the columns.
+
+        Returns:
+            memoryview: Timestamps
+            memoryview: Pressures
+            memoryview: Temperatures
+        """
+        return memoryview(self.timestamps), memoryview(self.pressures), memoryview(self.temperatures)
+
+    def tofile(self, f):
+        """Write the columns one after another in native byte order.
+
+        Args:
+            f (file): Binary file
+        """
+        self.timestamps.tofile(f)
+        self.pressures.tofile(f)
+        self.temperatures.tofile(f)
+
+    @classmethod
+    def fromfile(cls, f, n):
+        """Read a batch written by `tofile()`.
+
+        Args:
+            f (file): Binary file
+            n (int): Number of samples
+
+        Returns:
+            SampleBatch: Batch of `n` samples
+        """
+        batch = cls()
+        batch.timestamps.fromfile(f, n)
+        batch.pressures.fromfile(f, n)
+        batch.temperatures.fromfile(f, n)
+        return batch
@@ -0,0 +1,17 @@
+import DPS
+
+
+dps368 = DPS.DPS()
+
+# Publish on a 2 Pa or 0.1 C change, at most every 0.5 s, at least every 60 s
+deadband = DPS.stream.Deadband(pressure_abs=2.0, temperature_abs=0.1,
+                               min_interval=0.5, heartbeat=60.0)
+try:
+
+        for timestamp, p, t in DPS.stream.sampleStream(dps368, 0.1, deadband=deadband):
+
+            print(f'{timestamp:10.3f} s {p:8.1f} Pa {t:4.1f} C')
+
+except KeyboardInterrupt:
+
+        pass
@@ -0,0 +1,26 @@
+import DPS
+
+
+dps368 = DPS.DPS()
+
+server = DPS.server.SensorServer([dps368], '/tmp/dps.sock', interval=0.25)
+
+server.start()
+
+client = DPS.server.SensorClient('/tmp/dps.sock')
+
+try:
+
+        for timestamp, p, t in client.subscribe(backlog=1):
+
+            print(f'{timestamp:10.3f} s {p:8.1f} Pa {t:4.1f} C')
+
+except KeyboardInterrupt:
+
+        pass
+
+finally:
+
+        client.close()
+
+        server.close()
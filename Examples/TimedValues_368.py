@@ -0,0 +1,18 @@
+import DPS
+
+
+dps368 = DPS.DPS()
+
+# Read every new result of the sensor (4 Hz) with back-dated timestamps
+stats = DPS.stream.TimingStats(nominal=dps368.getSamplePeriod())
+try:
+
+        for timestamp, p, t in DPS.stream.sampleStream(dps368, None, stats=stats):
+
+            print(f'{timestamp:10.3f} s {p:8.1f} Pa {t:4.1f} C')
+
+except KeyboardInterrupt:
+
+        pass
+
+print(stats.report())
@@ -28,10 +28,15 @@ setup(
         'Topic :: System :: Hardware',
         'License :: OSI Approved :: MIT License',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.4',
-        'Programming Language :: Python :: 3.5',
+        'Programming Language :: Python :: 3.7',
     ],
 
     
-    py_modules=['DPS'],
+    packages=['DPS'],
+
+    python_requires='>=3.7',
+
+    entry_points={
+        'console_scripts': ['dps-acquire=DPS.cli:main'],
+    },
 )
\ No newline at end of file
@@ -0,0 +1,125 @@
+"""In-memory SMBus with a register model of a DPS310, for the tests.
+"""
+
+
+def _encode(value, bits):
+    return value & ((1 << bits) - 1)
+
+
+class FakeDPS310:
+    """Register model of one DPS310.
+
+    Results are the constant raw values `raw_p` / `raw_t`. A command mode
+    conversion completes at once; in background mode every read of MEAS_CFG
+    completes a temperature and a pressure measurement, and every read of
+    FIFO_STS adds one pair to the FIFO when it is enabled. Until `startup`
+    more reads of MEAS_CFG after power-up, SENSOR_RDY and COEF_RDY are
+    clear and writes are lost. After a write of MEAS_CFG, `latency` reads
+    of it pass before the first background measurement completes.
+    """
+
+    def __init__(self, raw_p=-312115, raw_t=52019):
+        self.raw_p = raw_p
+        self.raw_t = raw_t
+        self.latency = 0
+        self.pending = 0
+        self.powerUp()
+
+    def powerUp(self, startup=0):
+        """Boot with the default configuration, as after a brownout.
+
+        Args:
+            startup (int): Reads of MEAS_CFG until the sensor is ready
+        """
+        regs = self.regs = [0] * 0x100
+        c0, c1 = _encode(200, 12), _encode(-260, 12)
+        regs[0x10:0x13] = [c0 >> 4, ((c0 & 0x0F) << 4) | (c1 >> 8), c1 & 0xFF]
+        c00, c10 = _encode(80000, 20), _encode(-60000, 20)
+        regs[0x13:0x18] = [c00 >> 12, (c00 >> 4) & 0xFF, ((c00 & 0x0F) << 4) | (c10 >> 16),
+                           (c10 >> 8) & 0xFF, c10 & 0xFF]
+        for reg, value in ((0x18, -3000), (0x1A, 1000), (0x1C, -7000), (0x1E, 10), (0x20, -500)):
+            value = _encode(value, 16)
+            regs[reg:reg + 2] = [value >> 8, value & 0xFF]
+        regs[0x08] = 0x00 if startup else 0xC0
+        regs[0x0D] = 0x10
+        self.startup = startup
+        self.fifo = []
+
+    def __result(self, reg, value):
+        value = _encode(value, 24)
+        self.regs[reg:reg + 3] = [value >> 16, (value >> 8) & 0xFF, value & 0xFF]
+
+    def read(self, reg):
+        regs = self.regs
+        fifo = regs[0x09] & 0x02
+        if reg == 0x08 and self.startup:
+            self.startup -= 1
+            if not self.startup:
+                regs[0x08] |= 0xC0
+        elif reg == 0x08 and self.pending:
+            self.pending -= 1
+        elif reg == 0x08 and regs[0x08] & 0x07 == 0x07 and not fifo:
+            self.__result(0x00, self.raw_p)
+            self.__result(0x03, self.raw_t)
+            regs[0x08] |= 0x30
+        elif reg == 0x0B and fifo:
+            if regs[0x08] & 0x07 == 0x07:
+                self.fifo += [_encode(self.raw_t, 24) & ~0x01, _encode(self.raw_p, 24) | 0x01]
+            return (0x02 if len(self.fifo) >= 32 else 0x00) | (0x00 if self.fifo else 0x01)
+        elif reg == 0x00 and fifo:
+            self.__result(0x00, self.fifo.pop(0) if self.fifo else 0x800000)
+        value = regs[reg]
+        if 0x00 <= reg <= 0x02:
+            regs[0x08] &= ~0x10
+        elif 0x03 <= reg <= 0x05:
+            regs[0x08] &= ~0x20
+        return value
+
+    def write(self, reg, value):
+        regs = self.regs
+        if self.startup:
+            return
+        if reg == 0x08:
+            regs[0x08] = (regs[0x08] & 0xF0) | (value & 0x07)
+            self.pending = self.latency
+            if value & 0x07 == 0x01:
+                self.__result(0x00, self.raw_p)
+                regs[0x08] = (regs[0x08] & 0xF8) | 0x10
+            elif value & 0x07 == 0x02:
+                self.__result(0x03, self.raw_t)
+                regs[0x08] = (regs[0x08] & 0xF8) | 0x20
+        elif reg == 0x0C and value == 0x80:
+            self.fifo = []
+        elif reg == 0x0C and value == 0x09:
+            self.powerUp()
+        else:
+            regs[reg] = value
+
+
+class FakeBus:
+    """SMBus-compatible bus holding fake devices by address.
+    """
+
+    def __init__(self, devices):
+        self.devices = devices
+
+    def read_byte_data(self, addr, reg):
+        return self.__device(addr).read(reg)
+
+    def write_byte_data(self, addr, reg, value):
+        self.__device(addr).write(reg, value)
+
+    def read_i2c_block_data(self, addr, reg, length):
+        device = self.__device(addr)
+        return [device.read(reg + i) for i in range(length)]
+
+    def write_i2c_block_data(self, addr, reg, data):
+        device = self.__device(addr)
+        for i, value in enumerate(data):
+            device.write(reg + i, value)
+
+    def __device(self, addr):
+        try:
+            return self.devices[addr]
+        except KeyError:
+            raise OSError(121, 'Remote I/O error') from None
@@ -0,0 +1,18 @@
+import unittest
+
+from DPS.cli import discover
+
+from fakebus import FakeBus, FakeDPS310
+
+
+class DiscoverTest(unittest.TestCase):
+
+    def test_other_devices_skipped(self):
+        other = FakeDPS310()
+        other.regs[0x0D] = 0x00
+        bus = FakeBus({0x77: other, 0x76: FakeDPS310()})
+        self.assertEqual(discover(bus), [0x76])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,26 @@
+import unittest
+
+from DPS import DPS
+
+from fakebus import FakeBus, FakeDPS310
+
+
+class ConfigureTest(unittest.TestCase):
+
+    def setUp(self):
+        self.device = FakeDPS310()
+        self.sensor = DPS(FakeBus({0x77: self.device}), 0x77)
+
+    def test_command_to_background_waits_for_new_results(self):
+        self.sensor.configure(1, 8, background=False)
+        self.sensor.measureSample()
+        self.device.raw_p //= 2
+        self.sensor.configure(4, 64)
+        self.assertFalse(self.device.regs[0x08] & 0x30)
+        sample = self.sensor.measureSample()
+        self.assertEqual(sample.pressure, self.sensor._compensate(self.device.raw_p,
+                                                                  self.device.raw_t)[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
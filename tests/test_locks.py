@@ -0,0 +1,49 @@
+import gc
+import threading
+import time
+import unittest
+
+from DPS import DPS, busLock
+from DPS import transport
+
+from fakebus import FakeBus, FakeDPS310
+
+
+class BusLockTest(unittest.TestCase):
+
+    def test_waits_do_not_block_the_bus(self):
+        slow = FakeDPS310()
+        bus = FakeBus({0x77: slow, 0x76: FakeDPS310()})
+        a = DPS(bus, 0x77)
+        b = DPS(bus, 0x76)
+        slow.latency = 200
+        a.configure(4, 64)
+        for measure in (a.measureBothOnce, a.measurePressureOnce):
+            thread = threading.Thread(target=measure)
+            thread.start()
+            time.sleep(0.02)
+            start = time.monotonic()
+            b.measureSample()
+            self.assertLess(time.monotonic() - start, 0.05)
+            self.assertTrue(thread.is_alive())
+            thread.join()
+            a.configure(4, 64)
+
+    def test_results_read_in_one_burst(self):
+        device = FakeDPS310()
+        sensor = DPS(FakeBus({0x77: device}), 0x77, wait_ready=True)
+        temperature, pressure = sensor.measureBothOnce()
+        self.assertEqual((temperature, pressure), sensor._compensate(device.raw_p, device.raw_t))
+        self.assertEqual(sensor.measurePressureOnce(), pressure)
+
+    def test_lock_dropped_with_bus(self):
+        bus = FakeBus({})
+        self.assertIs(busLock(bus), busLock(bus))
+        count = len(transport._object_locks)
+        del bus
+        gc.collect()
+        self.assertEqual(len(transport._object_locks), count - 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
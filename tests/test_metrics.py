@@ -0,0 +1,36 @@
+import threading
+import unittest
+from urllib.request import urlopen
+
+from DPS import DPS
+from DPS.metrics import MetricsExporter
+
+from fakebus import FakeBus, FakeDPS310
+
+
+class MetricsExporterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.sensor = DPS(FakeBus({0x77: FakeDPS310()}), 0x77, wait_ready=True)
+
+    def test_close_without_start(self):
+        exporter = MetricsExporter([self.sensor], ('127.0.0.1', 0))
+        thread = threading.Thread(target=exporter.close, daemon=True)
+        thread.start()
+        thread.join(2.0)
+        self.assertFalse(thread.is_alive())
+
+    def test_scrape(self):
+        exporter = MetricsExporter([self.sensor], ('127.0.0.1', 0), sample=False)
+        exporter.metrics[0].update(self.sensor.measureSample())
+        exporter.start()
+        try:
+            host, port = exporter.address
+            text = urlopen('http://%s:%d/metrics' % (host, port), timeout=2.0).read().decode()
+        finally:
+            exporter.close()
+        self.assertIn('dps_samples_total{sensor="0"} 1\n', text)
+
+
+if __name__ == '__main__':
+    unittest.main()
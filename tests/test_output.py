@@ -0,0 +1,42 @@
+import io
+import unittest
+
+from DPS.output import RECORD, SENSOR_RECORD, SampleWriter
+
+
+SAMPLES = [(1.0, 100000.0, 21.5), (2.0, 100001.0, 21.75), (3.0, 100002.0, 22.0)]
+
+
+class SampleWriterTest(unittest.TestCase):
+
+    def write(self, format, sensor=False, **kwargs):
+        f = io.BytesIO()
+        with SampleWriter(f, format, batch_size=2, sensor=sensor, **kwargs) as writer:
+            for sample in SAMPLES:
+                if sensor:
+                    writer.write(sample, 0x77)
+                else:
+                    writer.write(sample)
+        return f.getvalue()
+
+    def test_csv_units(self):
+        lines = self.write('csv', pressure_unit='hPa', temperature_unit='K').decode().splitlines()
+        self.assertEqual(lines[0], 'timestamp,pressure_hPa,temperature_K')
+        self.assertEqual(lines[1], '1.000000,1000.00,294.650')
+        self.assertEqual(len(lines), 4)
+
+    def test_sensor_column(self):
+        lines = self.write('csv', sensor=True).decode().splitlines()
+        self.assertEqual(lines[0], 'sensor,timestamp,pressure_Pa,temperature_C')
+        self.assertEqual(lines[3], '0x77,3.000000,100002.00,22.000')
+        self.assertEqual(self.write('jsonl', sensor=True).decode().splitlines()[0],
+                         '{"sensor":"0x77","timestamp":1.000000,"pressure":100000.00,"temperature":21.500}')
+
+    def test_binary(self):
+        self.assertEqual(list(RECORD.iter_unpack(self.write('binary'))), SAMPLES)
+        self.assertEqual(list(SENSOR_RECORD.iter_unpack(self.write('binary', sensor=True))),
+                         [(0x77,) + sample for sample in SAMPLES])
+
+
+if __name__ == '__main__':
+    unittest.main()
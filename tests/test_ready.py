@@ -0,0 +1,20 @@
+import unittest
+
+from DPS import DPS
+
+from fakebus import FakeBus, FakeDPS310
+
+
+class WaitReadyTest(unittest.TestCase):
+
+    def test_configuration_written_after_power_up(self):
+        device = FakeDPS310()
+        device.powerUp(startup=5)
+        sensor = DPS(FakeBus({0x77: device}), 0x77, wait_ready=True)
+        self.assertEqual(device.regs[0x06:0x0A], [0x26, 0xA6, 0xF7, 0x0C])
+        self.assertAlmostEqual(sensor.measureSample().temperature,
+                               100 - 260 * device.raw_t / 1040384)
+
+
+if __name__ == '__main__':
+    unittest.main()
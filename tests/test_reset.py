@@ -0,0 +1,50 @@
+import unittest
+
+from DPS import DPS
+
+from fakebus import FakeBus, FakeDPS310
+
+
+class BrownoutTest(unittest.TestCase):
+
+    def setUp(self):
+        self.device = FakeDPS310()
+        self.sensor = DPS(FakeBus({0x77: self.device}), 0x77, check_interval=0.0)
+
+    def test_sample_after_reset_is_measured_again(self):
+        before = self.sensor.measureSample()
+        self.device.powerUp()
+        after = self.sensor.measureSample()
+        self.assertEqual(self.sensor.getStats()['reinits'], 1)
+        self.assertEqual(after.pressure, before.pressure)
+        self.assertEqual(after.temperature, before.temperature)
+
+    def test_legacy_reads_after_reset(self):
+        before = self.sensor.calcScaledPressure()
+        self.device.powerUp()
+        self.assertEqual(self.sensor.calcScaledTemperature(), self.device.raw_t / 1040384)
+        self.assertEqual(self.sensor.calcScaledPressure(), before)
+        self.assertEqual(self.sensor.getStats()['reinits'], 1)
+
+    def test_command_mode_after_reset(self):
+        self.sensor.configure(1, 8, background=False)
+        before = self.sensor.measureSample()
+        self.device.powerUp()
+        after = self.sensor.measureSample()
+        self.assertEqual(self.sensor.getStats()['reinits'], 1)
+        self.assertEqual(after.pressure, before.pressure)
+
+    def test_fifo_after_reset(self):
+        self.sensor.configure(8, 8, fifo=True)
+        before, _ = self.sensor.readFifo()
+        self.assertEqual(len(before), 1)
+        self.device.powerUp()
+        self.assertEqual(self.sensor.readFifo(), ([], False))
+        self.assertEqual(self.sensor.getStats()['reinits'], 1)
+        self.assertTrue(self.device.regs[0x09] & 0x02)
+        after, _ = self.sensor.readFifo()
+        self.assertEqual([s.pressure for s in after], [before[0].pressure])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import shutil
+import tempfile
+import unittest
+
+from DPS.rollup import RollupStore
+
+
+TIERS = ((1.0, 20), (10.0, 10))
+
+
+class RollupStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def store(self):
+        return RollupStore(self.directory, TIERS, offset=0.0)
+
+    def test_tier_selection(self):
+        with self.store() as store:
+            for i in range(20):
+                store.add((1000.0 + i, 100000.0 + i, 20.0))
+            finest = store.query(1000, 1019)
+            self.assertEqual([r.start for r in finest], [1000.0 + i for i in range(20)])
+            coarse = store.query(1000, 1019, 10.0)
+            self.assertEqual([(r.start, r.count) for r in coarse], [(1000.0, 10), (1010.0, 10)])
+            self.assertEqual(coarse[1].pressure_mean, 100014.5)
+            self.assertEqual([r.start for r in store.query(1000, 1019, 5.0)], [r.start for r in finest])
+            self.assertEqual([r.start for r in store.query(1000, 1019, 0.5)], [r.start for r in finest])
+
+    def test_resume_after_reopen(self):
+        with self.store() as store:
+            for i in range(5):
+                store.add((1000.0 + i, 100000.0, 20.0))
+        with self.store() as store:
+            for i in range(5, 8):
+                store.add((1000.0 + i, 100010.0, 21.0))
+            bucket, = store.query(1000, 1009, 10.0)
+        self.assertEqual(bucket.count, 8)
+        self.assertEqual(bucket.pressure_max, 100010.0)
+        self.assertEqual(bucket.temperature_last, 21.0)
+        with self.store() as store:
+            self.assertEqual(store.query(1000, 1009, 10.0), [bucket])
+
+    def test_ring_wrap(self):
+        with self.store() as store:
+            for i in range(45):
+                store.add((1000.0 + i, 100000.0 + i, 20.0))
+            rollups = store.query(1025, 1044)
+            self.assertEqual([r.start for r in rollups], [1025.0 + i for i in range(20)])
+            self.assertEqual([r.pressure_last for r in rollups], [100025.0 + i for i in range(20)])
+            # Overwritten by the newer lap, so served from the 10 s tier
+            older = store.query(1000, 1044)
+            self.assertEqual([r.start for r in older], [1000.0, 1010.0, 1020.0, 1030.0, 1040.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
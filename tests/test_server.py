@@ -0,0 +1,64 @@
+import threading
+import time
+import unittest
+
+from DPS import DPS
+from DPS.server import SampleCache, Sampler, SensorClient, SensorServer
+
+from fakebus import FakeBus, FakeDPS310
+
+
+class SamplerTest(unittest.TestCase):
+
+    def test_sampling_resumes_after_bus_failure(self):
+        device = FakeDPS310()
+        bus = FakeBus({0x77: device})
+        cache = SampleCache()
+        sampler = Sampler(DPS(bus, 0x77, retries=0), cache, interval=0.01)
+        del bus.devices[0x77]
+        sampler.start()
+        try:
+            deadline = time.monotonic() + 2.0
+            while not sampler.error_count and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertIsInstance(sampler.last_error, OSError)
+            bus.devices[0x77] = device
+            samples, seq = cache.last()
+            samples, seq = cache.since(seq, timeout=2.0)
+            self.assertTrue(samples)
+            self.assertTrue(sampler.is_alive())
+        finally:
+            sampler.stop()
+            sampler.join(1.0)
+
+
+class SensorServerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.sensor = DPS(FakeBus({0x77: FakeDPS310()}), 0x77, wait_ready=True)
+
+    def test_close_without_start(self):
+        server = SensorServer([self.sensor], ('127.0.0.1', 0))
+        thread = threading.Thread(target=server.close, daemon=True)
+        thread.start()
+        thread.join(2.0)
+        self.assertFalse(thread.is_alive())
+
+    def test_serve(self):
+        server = SensorServer([self.sensor], ('127.0.0.1', 0), interval=0.01)
+        server.start()
+        try:
+            client = SensorClient(server.server.server_address)
+            self.assertEqual(len(next(client.subscribe())), 3)
+            client.close()
+        finally:
+            server.close()
+
+    def test_non_loopback_rejected(self):
+        for host in ('', '0.0.0.0', '192.168.1.2', 'example.com'):
+            with self.assertRaises(ValueError):
+                SensorServer([self.sensor], (host, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+
+from DPS import DPS
+from DPS.sync import SyncGroup
+
+from fakebus import FakeBus, FakeDPS310
+
+
+class RecordingBus(FakeBus):
+
+    def __init__(self, devices):
+        super().__init__(devices)
+        self.log = []
+
+    def read_i2c_block_data(self, addr, reg, length):
+        self.log.append(('read', addr, reg))
+        return super().read_i2c_block_data(addr, reg, length)
+
+    def write_byte_data(self, addr, reg, value):
+        self.log.append(('write', addr, reg))
+        super().write_byte_data(addr, reg, value)
+
+
+class SyncGroupTest(unittest.TestCase):
+
+    def test_starts_back_to_back_with_reset_checks(self):
+        devices = {0x77: FakeDPS310(), 0x76: FakeDPS310()}
+        bus = RecordingBus(devices)
+        sensors = [DPS(bus, addr, check_interval=0.0) for addr in devices]
+        group = SyncGroup(sensors, 8)
+        devices[0x76].powerUp()
+        del bus.log[:]
+        batch, spread = group.measure()
+        starts = [i for i, (op, _, reg) in enumerate(bus.log) if op == 'write' and reg == 0x08]
+        self.assertEqual(len(starts), 4)
+        self.assertEqual((starts[1], starts[3]), (starts[0] + 1, starts[2] + 1))
+        self.assertEqual(sensors[1].getStats()['reinits'], 1)
+        self.assertEqual(batch.pressures[0], batch.pressures[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
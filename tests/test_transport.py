@@ -0,0 +1,63 @@
+import unittest
+
+from DPS import ConfigVerifyError, applyRegisterProgram
+
+from fakebus import FakeBus, FakeDPS310
+
+
+UNLOCK = ((0x0E, 0xA5), (0x0F, 0x96), (0x0E, 0x00), (0x0F, 0x00))
+
+
+class RecordingBus(FakeBus):
+
+    def __init__(self, devices):
+        super().__init__(devices)
+        self.writes = []
+
+    def write_byte_data(self, addr, reg, value):
+        self.writes.append((reg, [value]))
+        super().write_byte_data(addr, reg, value)
+
+    def write_i2c_block_data(self, addr, reg, data):
+        self.writes.append((reg, list(data)))
+        super().write_i2c_block_data(addr, reg, data)
+
+
+class ApplyRegisterProgramTest(unittest.TestCase):
+
+    def setUp(self):
+        self.device = FakeDPS310()
+        self.bus = RecordingBus({0x77: self.device})
+
+    def test_repeated_registers_written_in_order(self):
+        self.assertEqual(applyRegisterProgram(self.bus, 0x77, UNLOCK), 4)
+        self.assertEqual(self.bus.writes, [(0x0E, [0xA5, 0x96]), (0x0E, [0x00, 0x00])])
+        self.assertEqual(self.device.regs[0x0E:0x10], [0x00, 0x00])
+
+    def test_repeated_registers_rejected_for_readback(self):
+        with self.assertRaises(ValueError):
+            applyRegisterProgram(self.bus, 0x77, UNLOCK, skip_unchanged=True)
+        with self.assertRaises(ValueError):
+            applyRegisterProgram(self.bus, 0x77, UNLOCK, verify=True)
+        self.assertEqual(self.bus.writes, [])
+
+    def test_span_limited_to_one_block(self):
+        with self.assertRaises(ValueError):
+            applyRegisterProgram(self.bus, 0x77, ((0x0E, 0x00), (0x62, 0x02)), verify=True)
+
+    def test_skip_and_verify(self):
+        program = ((0x06, 0x26), (0x07, 0xA6), (0x09, 0x0C))
+        self.assertEqual(applyRegisterProgram(self.bus, 0x77, program, verify=True), 3)
+        self.assertEqual(applyRegisterProgram(self.bus, 0x77, program, skip_unchanged=True), 0)
+        self.device.startup = 1
+        with self.assertRaises(ConfigVerifyError):
+            applyRegisterProgram(self.bus, 0x77, ((0x06, 0x16),), verify=True)
+
+    def test_long_runs_split_into_blocks(self):
+        program = [(0x20 + i, i) for i in range(40)]
+        applyRegisterProgram(self.bus, 0x77, program)
+        self.assertEqual([len(data) for _, data in self.bus.writes], [32, 8])
+
+
+if __name__ == '__main__':
+    unittest.main()